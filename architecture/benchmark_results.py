@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Locust Benchmark Results for the Performance Diagrams
+Reads the *_stats.csv written by `locust --csv <prefix>` (or distributed.py's
+artifacts/stats_stats.csv) so performance diagrams show measured numbers
+instead of hard-coded ones.
+
+Results are looked up in architecture/benchmarks/ by default:
+  locust -f locustfile.py ... --csv ../architecture/benchmarks/candidate
+  cp benchmarks/candidate_stats.csv benchmarks/baseline_stats.csv   # promote
+
+Usage:
+  python benchmark_results.py                                   # compare default pair
+  python benchmark_results.py --candidate run.csv --baseline old_stats.csv --render
+"""
+
+import argparse
+import csv
+import glob
+import os
+
+BENCHMARK_DIR = os.environ.get(
+    "BENCHMARK_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+CANDIDATE = os.environ.get("BENCHMARK_CANDIDATE", os.path.join(BENCHMARK_DIR, "candidate"))
+BASELINE = os.environ.get("BENCHMARK_BASELINE", os.path.join(BENCHMARK_DIR, "baseline"))
+
+# Request name fragments -> service, checked in order; anything else is the todo service
+SERVICE_KEYWORDS = [
+    ("insights", ["AI Insights"]),
+    ("auth", ["Auth", "Login", "Logout", "Registration", "Verify", "/auth/"]),
+    ("frontend", ["Frontend", "Dashboard"]),
+]
+SERVICE_TITLES = {"auth": "Auth Service", "todo": "Todo Service", "frontend": "Frontend Service", "insights": "AI Insights"}
+
+
+def stats_csv_path(source):
+    """Resolve a *_stats.csv file, a --csv prefix or a directory holding one run; None if missing"""
+    if os.path.isdir(source):
+        candidates = sorted(glob.glob(os.path.join(source, "*_stats.csv")), key=os.path.getmtime)
+        return candidates[-1] if candidates else None
+    for path in (source, f"{source}_stats.csv"):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _metrics(row):
+    requests = int(_number(row["Request Count"]))
+    failures = int(_number(row["Failure Count"]))
+    return {
+        "requests": requests,
+        "failures": failures,
+        "success_pct": 100.0 * (requests - failures) / requests if requests else 0.0,
+        "p50": _number(row["50%"]),
+        "p95": _number(row["95%"]),
+        "p99": _number(row["99%"]),
+        "rps": _number(row["Requests/s"]),
+    }
+
+
+def service_for(name):
+    for service, keywords in SERVICE_KEYWORDS:
+        if any(keyword in name for keyword in keywords):
+            return service
+    return "todo"
+
+
+def load_locust_stats(source):
+    """Parse a locust stats CSV into per-endpoint and aggregated p50/p99/RPS; None if not found"""
+    path = stats_csv_path(source)
+    if path is None:
+        return None
+    endpoints = {}
+    aggregated = None
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            if row["Name"] == "Aggregated":
+                aggregated = _metrics(row)
+                continue
+            name = row["Name"] if row["Name"] not in endpoints else f"{row['Type']} {row['Name']}"
+            endpoints[name] = dict(_metrics(row), method=row["Type"], service=service_for(row["Name"]))
+    return {"source": path, "endpoints": endpoints, "aggregated": aggregated}
+
+
+def load_pair(candidate=None, baseline=None):
+    """Return (candidate, baseline) results; either may be None when no run was recorded"""
+    return load_locust_stats(candidate or CANDIDATE), load_locust_stats(baseline or BASELINE)
+
+
+def format_ms(value):
+    return f"{value / 1000:.1f}s" if value >= 1000 else f"{value:.0f}ms"
+
+
+def format_change(candidate, baseline, formatter):
+    """'new' or 'old → new' when a baseline value exists"""
+    if baseline is None:
+        return formatter(candidate)
+    return f"{formatter(baseline)} → {formatter(candidate)}"
+
+
+def top_endpoints(results, limit):
+    """Busiest endpoints first, so large runs still give a readable diagram"""
+    ranked = sorted(results["endpoints"].items(), key=lambda item: -item[1]["requests"])
+    return ranked[:limit] if limit else ranked
+
+
+def comparison_rows(candidate, baseline=None):
+    rows = []
+    for name, stats in sorted(candidate["endpoints"].items()):
+        base = baseline["endpoints"].get(name) if baseline else None
+        rows.append((name, stats, base))
+    rows.append(("Aggregated", candidate["aggregated"], baseline["aggregated"] if baseline else None))
+    return rows
+
+
+def print_comparison(candidate, baseline=None):
+    print(f"📊 Candidate: {candidate['source']}")
+    if baseline:
+        print(f"📊 Baseline:  {baseline['source']}")
+    width = max(len(name) for name in list(candidate["endpoints"]) + ["Aggregated"])
+    print(f"\n{'Endpoint':<{width}}  {'p50':>15}  {'p99':>15}  {'RPS':>15}  {'Success':>17}")
+    for name, stats, base in comparison_rows(candidate, baseline):
+        if stats is None:
+            continue
+        value = lambda key: base[key] if base else None
+        print(f"{name:<{width}}  "
+              f"{format_change(stats['p50'], value('p50'), format_ms):>15}  "
+              f"{format_change(stats['p99'], value('p99'), format_ms):>15}  "
+              f"{format_change(stats['rps'], value('rps'), lambda v: f'{v:.1f}'):>15}  "
+              f"{format_change(stats['success_pct'], value('success_pct'), lambda v: f'{v:.1f}%'):>17}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare locust runs and render the performance diagrams from them")
+    parser.add_argument("--candidate", default=CANDIDATE, help="Stats CSV, --csv prefix or directory of the new run")
+    parser.add_argument("--baseline", default=BASELINE, help="Stats CSV, --csv prefix or directory to compare against")
+    parser.add_argument("--render", action="store_true", help="Also render the performance diagrams")
+    parser.add_argument("-f", "--format", default="png", choices=["png", "svg", "pdf"])
+    args = parser.parse_args()
+
+    candidate, baseline = load_pair(args.candidate, args.baseline)
+    if candidate is None:
+        print(f"❌ No locust stats found at {args.candidate}")
+        raise SystemExit(1)
+    print_comparison(candidate, baseline)
+
+    if args.render:
+        from generate_diagram import generate_performance_optimization_diagram
+        from simple_diagram import generate_performance_diagram
+
+        generate_performance_optimization_diagram(args.format, candidate=args.candidate, baseline=args.baseline)
+        generate_performance_diagram(args.format, candidate=args.candidate, baseline=args.baseline)
+        print(f"\n✅ Performance diagrams rendered: performance_optimizations.{args.format}, performance_opts.{args.format}")
+
+
+if __name__ == "__main__":
+    main()
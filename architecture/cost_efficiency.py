@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Cost-per-Throughput Efficiency Report
+Combines the machine, resource-request and replica settings declared in
+terraform/*.tf with a locust run's measured throughput per replica count, and
+works out cost per million requests and cost at SLO-compliant capacity for
+each service.
+
+Throughput comes from an hpa_orchestrator.py timeline (replica counts change
+during the run) or, failing that, from a single locust stats CSV at the
+replica counts declared in terraform.
+
+Usage:
+  python cost_efficiency.py                                        # defaults in benchmarks/
+  python cost_efficiency.py --timeline ../locust/hpa-timeline.json --slo-p95 300 --render
+  python cost_efficiency.py --stats benchmarks/candidate --prices prices.json
+"""
+
+import argparse
+import json
+import os
+import re
+
+from benchmark_results import BENCHMARK_DIR, CANDIDATE, SERVICE_TITLES, load_locust_stats, service_for
+from topology import cluster, diagram, edge, node, render
+
+ARCHITECTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+TERRAFORM_DIR = os.path.join(os.path.dirname(ARCHITECTURE_DIR), "terraform")
+TIMELINE = os.path.join(BENCHMARK_DIR, "hpa-timeline.json")
+
+HOURS_PER_MONTH = 730
+
+# Approximate on-demand list prices for europe-west1 (USD/hour); override with --prices
+MACHINE_TYPES = {
+    "e2-micro": {"vcpu": 2, "memory_gb": 1, "hourly_usd": 0.0092},
+    "e2-small": {"vcpu": 2, "memory_gb": 2, "hourly_usd": 0.0184},
+    "e2-medium": {"vcpu": 2, "memory_gb": 4, "hourly_usd": 0.0368},
+    "e2-standard-2": {"vcpu": 2, "memory_gb": 8, "hourly_usd": 0.0737},
+    "e2-standard-4": {"vcpu": 4, "memory_gb": 16, "hourly_usd": 0.1474},
+    "e2-standard-8": {"vcpu": 8, "memory_gb": 32, "hourly_usd": 0.2948},
+}
+# Management fee; the GKE free tier credit covers it for one zonal cluster
+GKE_CLUSTER_FEE_HOURLY = 0.10
+ZONE_PATTERN = re.compile(r"-[a-z]$")
+
+RESOURCE_HEADER = re.compile(r'resource\s+"([\w-]+)"\s+"([\w-]+)"\s*\{')
+VARIABLE_HEADER = re.compile(r'variable\s+"([\w-]+)"\s*\{')
+
+
+# --- terraform -------------------------------------------------------------
+
+def strip_comments(text):
+    """Drop #, // and /* */ comments that are not inside a string"""
+    out, i, in_string = [], 0, False
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            out.append(char)
+            if char == "\\":
+                out.append(text[i + 1:i + 2])
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char == "#" or text.startswith("//", i):
+            while i < len(text) and text[i] != "\n":
+                i += 1
+            continue
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = len(text) if end < 0 else end + 2
+            continue
+        else:
+            out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def block_body(text, start):
+    """Return the text between the brace at `start` and its matching close brace"""
+    depth, in_string = 0, False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if char == '"' and text[i - 1] != "\\":
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:i]
+    return text[start + 1:]
+
+
+def attribute(body, key):
+    match = re.search(rf'^\s*{key}\s*=\s*(.+?)\s*$', body, re.M)
+    return match.group(1) if match else None
+
+
+def sub_block(body, key):
+    match = re.search(rf'\b{key}\s*=?\s*\{{', body)
+    return block_body(body, match.end() - 1) if match else ""
+
+
+def resolve(value, variables):
+    """Turn a terraform literal, var.x or "${var.x}-suffix" string into a Python value"""
+    if value is None:
+        return None
+    value = value.strip()
+    if value.startswith("var."):
+        return variables.get(value[4:])
+    if value.startswith('"') and value.endswith('"'):
+        return re.sub(r"\$\{var\.([\w-]+)\}", lambda m: str(variables.get(m.group(1), m.group(0))), value[1:-1])
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+def cpu_cores(quantity):
+    quantity = str(quantity)
+    return int(quantity[:-1]) / 1000.0 if quantity.endswith("m") else float(quantity)
+
+
+def memory_gb(quantity):
+    units = {"Ki": 1 / 1024.0 ** 2, "Mi": 1 / 1024.0, "Gi": 1.0, "Ti": 1024.0}
+    quantity = str(quantity)
+    for suffix, factor in units.items():
+        if quantity.endswith(suffix):
+            return float(quantity[:-len(suffix)]) * factor
+    return float(quantity) / 1024.0 ** 3
+
+
+def load_infrastructure(terraform_dir=TERRAFORM_DIR):
+    """Machine types, node counts and per-service replicas/requests declared in terraform/*.tf"""
+    text = ""
+    for filename in sorted(os.listdir(terraform_dir)):
+        if filename.endswith(".tf"):
+            with open(os.path.join(terraform_dir, filename)) as f:
+                text += strip_comments(f.read()) + "\n"
+
+    variables = {}
+    for match in VARIABLE_HEADER.finditer(text):
+        default = attribute(block_body(text, match.end() - 1), "default")
+        if default is not None:
+            variables[match.group(1)] = resolve(default, {})
+
+    resources = {}
+    for match in RESOURCE_HEADER.finditer(text):
+        resources[(match.group(1), match.group(2))] = block_body(text, match.end() - 1)
+
+    infrastructure = {"variables": variables, "gke": None, "database": None, "services": {}}
+    for (kind, name), body in resources.items():
+        if kind == "google_container_cluster":
+            location = resolve(attribute(body, "location"), variables) or ""
+            infrastructure["gke"] = {
+                "location": location,
+                "zonal": bool(ZONE_PATTERN.search(location)),
+                "machine_type": resolve(attribute(sub_block(body, "node_config"), "machine_type"), variables),
+                "node_count": resolve(attribute(body, "initial_node_count") or attribute(body, "node_count"), variables) or 1,
+            }
+        elif kind == "google_compute_instance" and "postgres" in name:
+            infrastructure["database"] = {"machine_type": resolve(attribute(body, "machine_type"), variables)}
+        elif kind == "kubernetes_deployment":
+            requests = sub_block(body, "requests")
+            infrastructure["services"][name.replace("_service", "")] = {
+                "deployment": name,
+                "replicas": resolve(attribute(sub_block(body, "spec"), "replicas"), variables) or 1,
+                "cpu_request": cpu_cores(resolve(attribute(requests, "cpu"), variables) or "0"),
+                "memory_request_gb": memory_gb(resolve(attribute(requests, "memory"), variables) or "0"),
+                "hpa": None,
+            }
+
+    for (kind, name), body in resources.items():
+        if kind.startswith("kubernetes_horizontal_pod_autoscaler"):
+            target = re.search(r"kubernetes_deployment\.([\w-]+)\.", body)
+            service = infrastructure["services"].get(target.group(1).replace("_service", "")) if target else None
+            if service is not None:
+                service["hpa"] = {
+                    "name": resolve(attribute(sub_block(body, "metadata"), "name"), variables),
+                    "min_replicas": resolve(attribute(body, "min_replicas"), variables),
+                    "max_replicas": resolve(attribute(body, "max_replicas"), variables),
+                }
+    return infrastructure
+
+
+# --- pricing ---------------------------------------------------------------
+
+def load_prices(path=None):
+    prices = {"machine_types": dict(MACHINE_TYPES), "gke_cluster_fee_hourly": GKE_CLUSTER_FEE_HOURLY}
+    if path:
+        with open(path) as f:
+            overrides = json.load(f)
+        prices["machine_types"].update(overrides.get("machine_types", {}))
+        prices["gke_cluster_fee_hourly"] = overrides.get("gke_cluster_fee_hourly", prices["gke_cluster_fee_hourly"])
+    return prices
+
+
+def machine(prices, machine_type):
+    if machine_type not in prices["machine_types"]:
+        raise ValueError(f"No price for machine type {machine_type!r}; add it with --prices")
+    return prices["machine_types"][machine_type]
+
+
+def pod_hourly(service, node_machine):
+    """A pod's share of its node, by whichever of its CPU or memory request is the larger fraction"""
+    share = max(service["cpu_request"] / node_machine["vcpu"], service["memory_request_gb"] / node_machine["memory_gb"])
+    return node_machine["hourly_usd"] * share
+
+
+def per_million(hourly_usd, rps):
+    return hourly_usd / (rps * 3600.0) * 1e6 if rps else None
+
+
+# --- throughput per replica count -----------------------------------------
+
+def throughput_from_timeline(timeline, infrastructure, slo_p95, slo_error_pct):
+    """{service: {replicas: [sample]}} with each sample's service RPS, p95, error rate and SLO verdict"""
+    by_service = {}
+    for sample in timeline["timeline"]:
+        grouped = {}
+        for name, stats in sample.get("endpoints", {}).items():
+            entry = grouped.setdefault(service_for(name), {"rps": 0.0, "errors": 0.0, "p95": 0})
+            entry["rps"] += stats["rps"]
+            entry["errors"] += stats["rps"] * stats["error_pct"] / 100.0
+            entry["p95"] = max(entry["p95"], stats["p95"])
+        for key, entry in grouped.items():
+            service = infrastructure["services"].get(key)
+            if service is None or not entry["rps"]:
+                continue
+            hpa_name = service["hpa"]["name"] if service["hpa"] else None
+            replicas = sample["replicas"].get(hpa_name, {}).get("current") or service["replicas"]
+            error_pct = 100.0 * entry["errors"] / entry["rps"]
+            by_service.setdefault(key, {}).setdefault(replicas, []).append({
+                "rps": entry["rps"], "p95": entry["p95"], "error_pct": error_pct,
+                "slo_ok": entry["p95"] <= slo_p95 and error_pct <= slo_error_pct,
+            })
+    return by_service
+
+
+def throughput_from_stats(results, infrastructure, slo_p95, slo_error_pct):
+    """One sample per service from a single locust run, at the replica counts declared in terraform"""
+    grouped = {}
+    for stats in results["endpoints"].values():
+        entry = grouped.setdefault(stats["service"], {"rps": 0.0, "failures": 0, "requests": 0, "p95": 0})
+        entry["rps"] += stats["rps"]
+        entry["failures"] += stats["failures"]
+        entry["requests"] += stats["requests"]
+        entry["p95"] = max(entry["p95"], stats["p95"])
+    by_service = {}
+    for key, entry in grouped.items():
+        service = infrastructure["services"].get(key)
+        if service is None or not entry["rps"]:
+            continue
+        replicas = service["hpa"]["min_replicas"] if service["hpa"] else service["replicas"]
+        error_pct = 100.0 * entry["failures"] / entry["requests"] if entry["requests"] else 0.0
+        by_service[key] = {replicas: [{
+            "rps": entry["rps"], "p95": entry["p95"], "error_pct": error_pct,
+            "slo_ok": entry["p95"] <= slo_p95 and error_pct <= slo_error_pct,
+        }]}
+    return by_service
+
+
+# --- report ----------------------------------------------------------------
+
+def build_report(infrastructure, throughput, prices, slo_p95, slo_error_pct, source):
+    node_machine = machine(prices, infrastructure["gke"]["machine_type"])
+    services = {}
+    for key, buckets in sorted(throughput.items()):
+        service = infrastructure["services"][key]
+        hourly = pod_hourly(service, node_machine)
+        rows = []
+        for replicas, samples in sorted(buckets.items()):
+            compliant = [s["rps"] for s in samples if s["slo_ok"]]
+            avg_rps = sum(s["rps"] for s in samples) / len(samples)
+            rows.append({
+                "replicas": replicas,
+                "samples": len(samples),
+                "avg_rps": round(avg_rps, 2),
+                "avg_p95_ms": round(sum(s["p95"] for s in samples) / len(samples), 1),
+                "slo_compliant_pct": round(100.0 * len(compliant) / len(samples), 1),
+                "max_slo_rps": round(max(compliant), 2) if compliant else None,
+                "hourly_usd": round(replicas * hourly, 4),
+                "usd_per_million": round(per_million(replicas * hourly, avg_rps), 4),
+            })
+
+        # Best SLO-compliant throughput per replica across all measured replica counts
+        best = max((row for row in rows if row["max_slo_rps"]), key=lambda row: row["max_slo_rps"] / row["replicas"], default=None)
+        capacity = None
+        if best:
+            per_replica = best["max_slo_rps"] / best["replicas"]
+            hpa = service["hpa"] or {"min_replicas": service["replicas"], "max_replicas": service["replicas"]}
+            capacity = {
+                "measured_at_replicas": best["replicas"],
+                "rps_per_replica": round(per_replica, 2),
+                "usd_per_million": round(per_million(hourly, per_replica), 4),
+                "max_rps_at_hpa_max": round(per_replica * hpa["max_replicas"], 1),
+                "monthly_usd_at_hpa_min": round(hpa["min_replicas"] * hourly * HOURS_PER_MONTH, 2),
+                "monthly_usd_at_hpa_max": round(hpa["max_replicas"] * hourly * HOURS_PER_MONTH, 2),
+            }
+        services[key] = {
+            "title": SERVICE_TITLES.get(key, key),
+            "cpu_request": service["cpu_request"],
+            "memory_request_gb": round(service["memory_request_gb"], 3),
+            "pod_hourly_usd": round(hourly, 5),
+            "hpa": service["hpa"],
+            "by_replicas": rows,
+            "slo_capacity": capacity,
+        }
+
+    database_machine = infrastructure["database"]["machine_type"] if infrastructure["database"] else None
+    fixed = {
+        "gke_nodes": round(infrastructure["gke"]["node_count"] * node_machine["hourly_usd"] * HOURS_PER_MONTH, 2),
+        "gke_cluster_fee": 0.0 if infrastructure["gke"]["zonal"] else round(prices["gke_cluster_fee_hourly"] * HOURS_PER_MONTH, 2),
+        "database_vm": round(machine(prices, database_machine)["hourly_usd"] * HOURS_PER_MONTH, 2) if database_machine else 0.0,
+    }
+    return {
+        "source": source,
+        "slo": {"p95_ms": slo_p95, "error_pct": slo_error_pct},
+        "gke_node": dict(infrastructure["gke"], **node_machine),
+        "database": infrastructure["database"],
+        "fixed_monthly_usd": dict(fixed, total=round(sum(fixed.values()), 2)),
+        "services": services,
+    }
+
+
+def load_report(timeline=None, stats=None, terraform_dir=TERRAFORM_DIR, prices=None, slo_p95=500, slo_error_pct=1.0):
+    """Build the report from a timeline if one exists, otherwise from a stats CSV; None without data"""
+    infrastructure = load_infrastructure(terraform_dir)
+    prices = prices or load_prices()
+    timeline_path = timeline or TIMELINE
+    if os.path.isfile(timeline_path):
+        with open(timeline_path) as f:
+            data = json.load(f)
+        throughput = throughput_from_timeline(data, infrastructure, slo_p95, slo_error_pct)
+        source = timeline_path
+    else:
+        results = load_locust_stats(stats or CANDIDATE)
+        if results is None:
+            return None
+        throughput = throughput_from_stats(results, infrastructure, slo_p95, slo_error_pct)
+        source = results["source"]
+    return build_report(infrastructure, throughput, prices, slo_p95, slo_error_pct, source)
+
+
+def money(value):
+    if value is None:
+        return "-"
+    if value == 0:
+        return "$0"
+    return f"${value:,.2f}" if value >= 1 else f"${value:.4f}"
+
+
+def print_report(report):
+    print(f"💰 Cost efficiency from {report['source']}")
+    print(f"   SLO: p95 ≤ {report['slo']['p95_ms']}ms, errors ≤ {report['slo']['error_pct']}%")
+    gke = report["gke_node"]
+    print(f"   GKE: {gke['node_count']} × {gke['machine_type']} ({gke['vcpu']} vCPU, {gke['memory_gb']}GB)")
+    for key, service in report["services"].items():
+        print(f"\n📦 {service['title']} ({service['cpu_request'] * 1000:.0f}m CPU / {service['memory_request_gb'] * 1024:.0f}Mi "
+              f"→ {money(service['pod_hourly_usd'])}/h per pod)")
+        print(f"   {'Replicas':>8}  {'Samples':>7}  {'Avg RPS':>8}  {'p95':>7}  {'SLO ok':>7}  {'$/1M req':>9}")
+        for row in service["by_replicas"]:
+            print(f"   {row['replicas']:>8}  {row['samples']:>7}  {row['avg_rps']:>8.1f}  {row['avg_p95_ms']:>5.0f}ms  "
+                  f"{row['slo_compliant_pct']:>6.0f}%  {money(row['usd_per_million']):>9}")
+        capacity = service["slo_capacity"]
+        if capacity:
+            print(f"   ✅ SLO capacity: {capacity['rps_per_replica']} req/s per replica → {money(capacity['usd_per_million'])}/1M req; "
+                  f"{money(capacity['monthly_usd_at_hpa_min'])}–{money(capacity['monthly_usd_at_hpa_max'])}/month, "
+                  f"up to {capacity['max_rps_at_hpa_max']} req/s at HPA max")
+        else:
+            print("   ⚠️  No SLO-compliant samples")
+    fixed = report["fixed_monthly_usd"]
+    print(f"\n🏗️  Fixed monthly: GKE nodes {money(fixed['gke_nodes'])}, cluster fee {money(fixed['gke_cluster_fee'])}, "
+          f"database VM {money(fixed['database_vm'])} = {money(fixed['total'])}")
+
+
+def cost_efficiency_spec(report):
+    """Spec for the measured cost-efficiency diagram"""
+    services = []
+    for key, service in report["services"].items():
+        capacity = service["slo_capacity"]
+        if capacity:
+            detail = (f"{capacity['rps_per_replica']} req/s per pod @ SLO\n"
+                      f"{money(capacity['usd_per_million'])} / 1M req\n"
+                      f"{money(capacity['monthly_usd_at_hpa_min'])}–{money(capacity['monthly_usd_at_hpa_max'])}/month")
+        else:
+            detail = "No SLO-compliant samples"
+        services.append(node(f"{key}_cost", f"{service['title']}\n{detail}", kind="pod"))
+
+    fixed = report["fixed_monthly_usd"]
+    gke = report["gke_node"]
+    return diagram(
+        f"Cost Efficiency at SLO (p95 ≤ {report['slo']['p95_ms']}ms)", "cost_efficiency", "TB",
+        [
+            cluster("Per-Service Cost at SLO Capacity", *services),
+            cluster(
+                "Fixed Monthly Costs",
+                node("nodes_cost", f"GKE Nodes\n{gke['node_count']} × {gke['machine_type']}\n{money(fixed['gke_nodes'])}", kind="gke"),
+                node("database_cost", f"Database VM\n{(report['database'] or {}).get('machine_type', '-')}\n{money(fixed['database_vm'])}", kind="compute_engine"),
+                node("fee_cost", f"Cluster Fee\n{money(fixed['gke_cluster_fee'])}", kind="gcs"),
+            ),
+            node("total", f"Fixed Total\n{money(fixed['total'])}/month", kind="gcs"),
+        ],
+        [edge(["nodes_cost", "database_cost", "fee_cost"], "total")]
+        + [edge(f"{key}_cost", "nodes_cost", "runs on") for key in report["services"]],
+    )
+
+
+def generate_cost_efficiency_diagram(outformat="png", use_cache=True, timeline=None, stats=None, slo_p95=500):
+    """Generate the cost-efficiency diagram from the latest measured throughput"""
+    report = load_report(timeline, stats, slo_p95=slo_p95)
+    if report is None:
+        print(f"⚠️  No locust results in {BENCHMARK_DIR}, skipping cost_efficiency")
+        return None
+    return render(cost_efficiency_spec(report), outformat, use_cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost per throughput from terraform settings and locust results")
+    parser.add_argument("--terraform-dir", default=TERRAFORM_DIR)
+    parser.add_argument("--timeline", default=TIMELINE, help="hpa_orchestrator.py timeline JSON")
+    parser.add_argument("--stats", default=CANDIDATE, help="Locust stats CSV/prefix, used when there is no timeline")
+    parser.add_argument("--slo-p95", type=float, default=500, help="p95 latency SLO in ms")
+    parser.add_argument("--slo-error", type=float, default=1.0, help="Error rate SLO in percent")
+    parser.add_argument("--prices", help="JSON overriding machine_types / gke_cluster_fee_hourly")
+    parser.add_argument("--output", default="cost-efficiency.json", help="Report output file")
+    parser.add_argument("--render", action="store_true", help="Also render the cost_efficiency diagram")
+    parser.add_argument("-f", "--format", default="png", choices=["png", "svg", "pdf"])
+    args = parser.parse_args()
+
+    report = load_report(args.timeline, args.stats, args.terraform_dir, load_prices(args.prices),
+                         args.slo_p95, args.slo_error)
+    if report is None:
+        print(f"❌ No timeline at {args.timeline} and no locust stats at {args.stats}")
+        raise SystemExit(1)
+    print_report(report)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📁 Report written to {args.output}")
+
+    if args.render:
+        render(cost_efficiency_spec(report), args.format)
+        print(f"✅ Cost efficiency diagram generated: cost_efficiency.{args.format}")
+
+
+if __name__ == "__main__":
+    main()
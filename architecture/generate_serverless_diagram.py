@@ -4,192 +4,149 @@ Serverless Functions Architecture Diagram Generator
 Detailed visualization of Cloud Functions in our Todo Application
 """
 
-from diagrams import Diagram, Cluster, Edge
-from diagrams.gcp.compute import GKE, ComputeEngine, Functions
-from diagrams.gcp.database import SQL
-from diagrams.gcp.network import LoadBalancing, VPC
-from diagrams.gcp.storage import GCS
-from diagrams.gcp.devtools import ContainerRegistry
-from diagrams.k8s.compute import Pod, Deployment
-from diagrams.k8s.network import Service
-from diagrams.onprem.client import Users
-from diagrams.programming.language import NodeJS
-
-def generate_updated_architecture_diagram():
-    """Generate the complete architecture diagram with detailed serverless functions"""
-    
-    with Diagram("Cloud-Native Todo Application - Serverless Architecture", show=False, direction="TB", filename="todo_app_serverless_architecture"):
-        
-        # External users
-        users = Users("Users")
-        
-        with Cluster("Google Cloud Platform"):
-            
-            with Cluster("Google Kubernetes Engine (GKE Autopilot)"):
-                with Cluster("todo-app namespace"):
-                    # Frontend
-                    with Cluster("Frontend Service"):
-                        frontend_pod = Pod("React App\n(Port: 30080)")
-                        frontend_service = Service("NodePort Service")
-                        frontend_hpa = Deployment("HPA: 1-5 replicas")
-                    
-                    # Auth Service
-                    with Cluster("Auth Service"):
-                        auth_pod = Pod("Node.js Auth\n(Port: 30081)")
-                        auth_service = Service("NodePort Service")
-                        auth_hpa = Deployment("HPA: 1-5 replicas")
-                    
-                    # Todo Service
-                    with Cluster("Todo Service"):
-                        todo_pod = Pod("Node.js Todo\n(Port: 30082)")
-                        todo_service = Service("NodePort Service")
-                        todo_hpa = Deployment("HPA: 1-5 replicas")
-                    
-                    # Service mesh connections
-                    frontend_service >> Edge(label="Internal API calls") >> auth_service
-                    frontend_service >> Edge(label="CRUD operations") >> todo_service
-            
+from topology import (
+    DATABASE_ADDRESS, DATABASE_EDGES, DELIVERY_EDGES, GKE_SERVICE_EDGES, INGRESS_EDGES, SERVICES,
+    cluster, diagram, edge, gcp_platform, node, render,
+)
+
+def updated_architecture_spec():
+    """Spec for the complete architecture diagram with detailed serverless functions"""
+
+    # Cloud Functions - Serverless Microservices
+    functions = [
+        node("todo_insights", "Todo Insights Function\n• AI Categorization\n• Priority Prediction\n• Natural Language API\n• 256MB, Node.js 18\n• VPC Connector"),
+        node("todo_analytics", "Todo Analytics Function\n• Global Statistics\n• User Activity\n• Trend Analysis\n• PostgreSQL Pool\n• 256MB, 60s timeout"),
+        node("health_monitor", "Health Monitor Function\n• System Health Checks\n• Automated Monitoring\n• Service Status\n• 256MB, 30s timeout\n• Scheduled Execution"),
+    ]
+
+    return diagram(
+        "Cloud-Native Todo Application - Serverless Architecture", "todo_app_serverless_architecture", "TB",
+        [node("users"), gcp_platform(functions)],
+        GKE_SERVICE_EDGES + INGRESS_EDGES + DATABASE_EDGES + [
+            # Serverless Functions connections - More detailed
+            edge("todo_pod", "todo_insights", "AI Categorization\nPriority Prediction\nPOST /insights"),
+            edge("frontend_service", "todo_analytics", "Analytics Reports\nStatistics\nGET /analytics"),
+            edge("health_monitor", ["auth_service", "todo_service", "frontend_service"], "Health Checks\nPeriodic Monitoring"),
+
+            # Database connections for functions
+            edge("todo_insights", "database", "Todo Update\nCategory & Priority\nINSERT/UPDATE"),
+            edge("todo_analytics", "database", "Analytics Query\nAggregate Data\nSELECT"),
+        ] + DELIVERY_EDGES + [
+            edge("cicd", ["todo_insights", "todo_analytics", "health_monitor"], "Deploy Functions"),
+        ],
+    )
+
+def serverless_details_spec():
+    """Spec for the detailed serverless functions architecture"""
+
+    ports = {key: service["port"] for key, service in SERVICES.items()}
+
+    return diagram(
+        "Serverless Functions Detailed Architecture", "serverless_functions_detail", "LR",
+        [
+            node("users", "Frontend\nReact App"),
+            cluster(
+                "Cloud Functions (Serverless Microservices)",
+                cluster(
+                    "Todo Insights Function",
+                    node("insights_trigger", "HTTP Trigger\nhttps://...insights", kind="function"),
+                    node("insights_nlp", "Natural Language\nAPI Processing\nEntities & Sentiment", kind="nodejs"),
+                    node("insights_categorize", "Category Prediction\nWork, Personal,\nHealth, Shopping,\nFinance, Education,\nTravel, Maintenance", kind="nodejs"),
+                    node("insights_priority", "Priority Prediction\nHigh, Medium, Low\nKeyword Analysis", kind="nodejs"),
+                ),
+                cluster(
+                    "Todo Analytics Function",
+                    node("analytics_trigger", "HTTP Trigger\nhttps://...analytics", kind="function"),
+                    node("analytics_stats", "Global Stats\nTotal Todos\nCompletion Rate", kind="nodejs"),
+                    node("analytics_trends", "Trend Analysis\nWeekly/Monthly\nUser Activity", kind="nodejs"),
+                    node("analytics_reports", "Category Distribution\nPriority Analysis\nTime-based Reports", kind="nodejs"),
+                ),
+                cluster(
+                    "Health Monitor Function",
+                    node("health_trigger", "Scheduled Trigger\nCron: */5 * * * *\nEvery 5 minutes", kind="function"),
+                    node("health_check", f"Service Health Check\nAuth: :{ports['auth']}/health\nTodo: :{ports['todo']}/health\nFrontend: :{ports['frontend']}", kind="nodejs"),
+                    node("health_alerts", "Alert System\nStatus Reporting\nResponse Time\nError Rate", kind="nodejs"),
+                ),
+            ),
             # Database
-            with Cluster("Compute Engine"):
-                database = ComputeEngine("PostgreSQL\n(e2-micro)")
-            
-            # Cloud Functions - Serverless Microservices
-            with Cluster("Cloud Functions (Serverless)"):
-                todo_insights = Functions("Todo Insights Function\n• AI Categorization\n• Priority Prediction\n• Natural Language API\n• 256MB, Node.js 18\n• VPC Connector")
-                todo_analytics = Functions("Todo Analytics Function\n• Global Statistics\n• User Activity\n• Trend Analysis\n• PostgreSQL Pool\n• 256MB, 60s timeout")
-                health_monitor = Functions("Health Monitor Function\n• System Health Checks\n• Automated Monitoring\n• Service Status\n• 256MB, 30s timeout\n• Scheduled Execution")
-            
-            # Container Registry
-            registry = ContainerRegistry("Container Registry\n- auth:optimized-v4\n- frontend:updated-v2\n- todo:latest")
-            
-            # CI/CD (using generic GCS for build artifacts)
-            cicd = GCS("Cloud Build\nCI/CD Pipeline")
-            
-            # Network
-            with Cluster("VPC Network"):
-                vpc = VPC("Private Network\n10.0.1.0/24")
-                lb = LoadBalancing("Load Balancer\nNodePort Services")
-        
-        # External connections
-        users >> Edge(label="HTTP Requests") >> lb
-        lb >> frontend_service
-        
-        # Internal service connections
-        auth_pod >> Edge(label="DB Queries\n+ Connection Pool\n+ Caching\n+ Circuit Breaker") >> database
-        todo_pod >> Edge(label="DB Queries") >> database
-        
-        # Serverless Functions connections - More detailed
-        todo_pod >> Edge(label="AI Categorization\nPriority Prediction\nPOST /insights") >> todo_insights
-        frontend_service >> Edge(label="Analytics Reports\nStatistics\nGET /analytics") >> todo_analytics
-        health_monitor >> Edge(label="Health Checks\nPeriodic Monitoring") >> [auth_service, todo_service, frontend_service]
-        
-        # Database connections for functions
-        todo_insights >> Edge(label="Todo Update\nCategory & Priority\nINSERT/UPDATE") >> database
-        todo_analytics >> Edge(label="Analytics Query\nAggregate Data\nSELECT") >> database
-        
-        # CI/CD connections
-        cicd >> Edge(label="Build & Push") >> registry
-        registry >> Edge(label="Pull images") >> [frontend_pod, auth_pod, todo_pod]
-        cicd >> Edge(label="Deploy Functions") >> [todo_insights, todo_analytics, health_monitor]
-
-def generate_serverless_details_diagram():
+            node("database", f"PostgreSQL\nCompute Engine\n{DATABASE_ADDRESS}", kind="sql"),
+            # External services monitoring
+            cluster(
+                "Monitored K8s Services",
+                node("auth_service", f"Auth Service\nNodePort :{ports['auth']}"),
+                node("todo_service", f"Todo Service\nNodePort :{ports['todo']}"),
+                node("frontend_service", f"Frontend\nNodePort :{ports['frontend']}"),
+            ),
+        ],
+        [
+            edge("insights_trigger", "insights_nlp"),
+            edge("insights_nlp", ["insights_categorize", "insights_priority"]),
+            edge("analytics_trigger", ["analytics_stats", "analytics_trends", "analytics_reports"]),
+            edge("health_trigger", "health_check"),
+            edge("health_check", "health_alerts"),
+
+            # Connections
+            edge("users", "insights_trigger", "POST /insights\n{title, description, userId}"),
+            edge("users", "analytics_trigger", "GET /analytics\n?action=global-stats"),
+
+            edge("insights_categorize", "database", "UPDATE todos SET\ncategory, priority"),
+            edge("insights_priority", "database", "AI prediction results"),
+
+            edge("analytics_stats", "database", "SELECT COUNT(*),\nAVG(completion_rate)"),
+            edge("analytics_trends", "database", "GROUP BY date,\nuser activity"),
+            edge("analytics_reports", "database", "Analytics queries\nJOIN operations"),
+
+            edge("health_check", ["auth_service", "todo_service", "frontend_service"], "GET /health\nTimeout: 5s\nStatus check"),
+        ],
+    )
+
+def function_specs_spec():
+    """Spec for the Cloud Functions specifications and costs"""
+
+    return diagram(
+        "Cloud Functions Technical Specifications", "cloud_functions_specs", "TB",
+        [
+            cluster(
+                "Function Specifications & Costs",
+                cluster("Todo Insights Function", node("insights_specs", "• Runtime: Node.js 18\n• Memory: 256MB\n• Timeout: 60s\n• Max Instances: 10\n• VPC Connector: Enabled\n• Service Account: insights-sa\n\nDependencies:\n• @google-cloud/language\n• @google-cloud/functions-framework\n• pg (PostgreSQL)\n\nCost: ~$1.20/month", kind="function")),
+                cluster("Todo Analytics Function", node("analytics_specs", "• Runtime: Node.js 18\n• Memory: 256MB\n• Timeout: 60s\n• Max Instances: 10\n• Connection Pool: 10 max\n• Service Account: analytics-sa\n\nDependencies:\n• @google-cloud/functions-framework\n• pg (PostgreSQL)\n\nCost: ~$0.80/month", kind="function")),
+                cluster("Health Monitor Function", node("health_specs", "• Runtime: Node.js 18\n• Memory: 256MB\n• Timeout: 30s\n• Max Instances: 5\n• Schedule: */5 * * * *\n• Public Access: Enabled\n\nDependencies:\n• @google-cloud/functions-framework\n• axios (HTTP client)\n\nCost: ~$0.23/month", kind="function")),
+            ),
+            cluster("Total Serverless Cost", node("total_cost", "Cloud Functions Total\n$2.23/month (1.5%)\n\n150MB average memory\n~2,000 invocations/month\n5s average execution time", kind="gcs")),
+        ],
+        [edge(["insights_specs", "analytics_specs", "health_specs"], "total_cost")],
+    )
+
+def generate_updated_architecture_diagram(outformat="png", use_cache=True):
+    """Generate the complete architecture diagram with detailed serverless functions"""
+    return render(updated_architecture_spec(), outformat, use_cache)
+
+def generate_serverless_details_diagram(outformat="png", use_cache=True):
     """Generate detailed serverless functions architecture"""
-    
-    with Diagram("Serverless Functions Detailed Architecture", show=False, direction="LR", filename="serverless_functions_detail"):
-        
-        users = Users("Frontend\nReact App")
-        
-        with Cluster("Cloud Functions (Serverless Microservices)"):
-            
-            with Cluster("Todo Insights Function"):
-                insights_trigger = Functions("HTTP Trigger\nhttps://...insights")
-                insights_nlp = NodeJS("Natural Language\nAPI Processing\nEntities & Sentiment")
-                insights_categorize = NodeJS("Category Prediction\nWork, Personal,\nHealth, Shopping,\nFinance, Education,\nTravel, Maintenance")
-                insights_priority = NodeJS("Priority Prediction\nHigh, Medium, Low\nKeyword Analysis")
-                
-                insights_trigger >> insights_nlp
-                insights_nlp >> insights_categorize
-                insights_nlp >> insights_priority
-            
-            with Cluster("Todo Analytics Function"):
-                analytics_trigger = Functions("HTTP Trigger\nhttps://...analytics")
-                analytics_stats = NodeJS("Global Stats\nTotal Todos\nCompletion Rate")
-                analytics_trends = NodeJS("Trend Analysis\nWeekly/Monthly\nUser Activity")
-                analytics_reports = NodeJS("Category Distribution\nPriority Analysis\nTime-based Reports")
-                
-                analytics_trigger >> analytics_stats
-                analytics_trigger >> analytics_trends  
-                analytics_trigger >> analytics_reports
-            
-            with Cluster("Health Monitor Function"):
-                health_trigger = Functions("Scheduled Trigger\nCron: */5 * * * *\nEvery 5 minutes")
-                health_check = NodeJS("Service Health Check\nAuth: :30081/health\nTodo: :30082/health\nFrontend: :30080")
-                health_alerts = NodeJS("Alert System\nStatus Reporting\nResponse Time\nError Rate")
-                
-                health_trigger >> health_check
-                health_check >> health_alerts
-        
-        # Database
-        database = SQL("PostgreSQL\nCompute Engine\n10.0.1.2:5432")
-        
-        # Connections
-        users >> Edge(label="POST /insights\n{title, description, userId}") >> insights_trigger
-        users >> Edge(label="GET /analytics\n?action=global-stats") >> analytics_trigger
-        
-        insights_categorize >> Edge(label="UPDATE todos SET\ncategory, priority") >> database
-        insights_priority >> Edge(label="AI prediction results") >> database
-        
-        analytics_stats >> Edge(label="SELECT COUNT(*),\nAVG(completion_rate)") >> database
-        analytics_trends >> Edge(label="GROUP BY date,\nuser activity") >> database
-        analytics_reports >> Edge(label="Analytics queries\nJOIN operations") >> database
-        
-        # External services monitoring
-        with Cluster("Monitored K8s Services"):
-            auth_svc = Service("Auth Service\nNodePort :30081")
-            todo_svc = Service("Todo Service\nNodePort :30082") 
-            frontend_svc = Service("Frontend\nNodePort :30080")
-        
-        health_check >> Edge(label="GET /health\nTimeout: 5s\nStatus check") >> [auth_svc, todo_svc, frontend_svc]
-
-def generate_function_specs_diagram():
+    return render(serverless_details_spec(), outformat, use_cache)
+
+def generate_function_specs_diagram(outformat="png", use_cache=True):
     """Generate Cloud Functions specifications and costs"""
-    
-    with Diagram("Cloud Functions Technical Specifications", show=False, direction="TB", filename="cloud_functions_specs"):
-        
-        with Cluster("Function Specifications & Costs"):
-            
-            with Cluster("Todo Insights Function"):
-                insights_specs = Functions("• Runtime: Node.js 18\n• Memory: 256MB\n• Timeout: 60s\n• Max Instances: 10\n• VPC Connector: Enabled\n• Service Account: insights-sa\n\nDependencies:\n• @google-cloud/language\n• @google-cloud/functions-framework\n• pg (PostgreSQL)\n\nCost: ~$1.20/month")
-            
-            with Cluster("Todo Analytics Function"):
-                analytics_specs = Functions("• Runtime: Node.js 18\n• Memory: 256MB\n• Timeout: 60s\n• Max Instances: 10\n• Connection Pool: 10 max\n• Service Account: analytics-sa\n\nDependencies:\n• @google-cloud/functions-framework\n• pg (PostgreSQL)\n\nCost: ~$0.80/month")
-            
-            with Cluster("Health Monitor Function"):
-                health_specs = Functions("• Runtime: Node.js 18\n• Memory: 256MB\n• Timeout: 30s\n• Max Instances: 5\n• Schedule: */5 * * * *\n• Public Access: Enabled\n\nDependencies:\n• @google-cloud/functions-framework\n• axios (HTTP client)\n\nCost: ~$0.23/month")
-        
-        with Cluster("Total Serverless Cost"):
-            total_cost = GCS("Cloud Functions Total\n$2.23/month (1.5%)\n\n150MB average memory\n~2,000 invocations/month\n5s average execution time")
-        
-        [insights_specs, analytics_specs, health_specs] >> total_cost
+    return render(function_specs_spec(), outformat, use_cache)
 
 if __name__ == "__main__":
     print("Generating serverless architecture diagrams...")
-    
+
     # Generate updated main architecture with serverless details
     generate_updated_architecture_diagram()
     print("✅ Updated architecture diagram generated: todo_app_serverless_architecture.png")
-    
+
     # Generate serverless functions detail diagram
-    generate_serverless_details_diagram() 
+    generate_serverless_details_diagram()
     print("✅ Serverless functions detail diagram generated: serverless_functions_detail.png")
-    
+
     # Generate function specifications diagram
     generate_function_specs_diagram()
     print("✅ Function specifications diagram generated: cloud_functions_specs.png")
-    
+
     print("\n🎯 Serverless architecture diagrams generated successfully!")
     print("📁 Check the current directory for PNG files")
     print("\n📋 Generated diagrams:")
     print("   1. todo_app_serverless_architecture.png - Main architecture + serverless details")
-    print("   2. serverless_functions_detail.png - Function workflow details") 
-    print("   3. cloud_functions_specs.png - Technical specifications & costs") 
\ No newline at end of file
+    print("   2. serverless_functions_detail.png - Function workflow details")
+    print("   3. cloud_functions_specs.png - Technical specifications & costs")
@@ -0,0 +1,53 @@
+"""
+Content-Hash Render Cache for Architecture Diagrams
+Skips Graphviz when a diagram's spec, output format and diagrams version
+are unchanged and the rendered file is still on disk. One small digest file
+per output keeps concurrent renders from racing on a shared index.
+"""
+
+import hashlib
+import json
+import os
+
+DEFAULT_CACHE_DIR = ".render-cache"
+
+# Bump when the renderer changes in a way that alters output for the same spec
+RENDERER_VERSION = "1"
+
+
+def _diagrams_version():
+    try:
+        from importlib.metadata import version
+        return version("diagrams")
+    except Exception:
+        return "unknown"
+
+
+def spec_digest(spec, outformat):
+    payload = json.dumps(
+        {"spec": spec, "format": outformat, "diagrams": _diagrams_version(), "renderer": RENDERER_VERSION},
+        sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _digest_path(output, cache_dir):
+    return os.path.join(cache_dir, os.path.basename(output) + ".sha256")
+
+
+def is_fresh(output, digest, cache_dir=DEFAULT_CACHE_DIR):
+    """True if output exists and was rendered from the same digest"""
+    path = _digest_path(output, cache_dir)
+    if not os.path.exists(output) or not os.path.exists(path):
+        return False
+    with open(path) as f:
+        return f.read().strip() == digest
+
+
+def store(output, digest, cache_dir=DEFAULT_CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _digest_path(output, cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(digest + "\n")
+    os.replace(tmp_path, path)
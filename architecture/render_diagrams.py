@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Batch Diagram Renderer
+Discovers every generate_* function in the architecture modules and renders
+them in a process pool, in one or more output formats, reporting how long
+each diagram took (or that the render cache skipped it).
+
+Usage:
+  python render_diagrams.py                       # all diagrams as PNG
+  python render_diagrams.py -f png -f svg -f pdf  # every format in one pass
+  python render_diagrams.py --only cost --force   # matching diagrams, ignore cache
+  python render_diagrams.py --list
+"""
+
+import argparse
+import fnmatch
+import importlib
+import inspect
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ARCHITECTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+FORMATS = ["png", "svg", "pdf"]
+
+# generate_* return value -> (status, icon)
+STATUSES = {True: ("rendered", "✅"), False: ("cached", "♻️ "), None: ("skipped", "⚠️ ")}
+
+# Support modules that define no diagrams of their own
+SKIP_MODULES = {"topology", "render_cache", "render_diagrams", "benchmark_results"}
+
+
+def discover(directory=ARCHITECTURE_DIR):
+    """Return [(module, function)] for every generate_* callable without required arguments"""
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    found = []
+    for filename in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(filename)
+        if ext != ".py" or name in SKIP_MODULES:
+            continue
+        module = importlib.import_module(name)
+        for function_name, function in inspect.getmembers(module, inspect.isfunction):
+            if not function_name.startswith("generate_") or function.__module__ != name:
+                continue
+            required = [param for param in inspect.signature(function).parameters.values()
+                        if param.default is param.empty and param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)]
+            if not required:
+                found.append((name, function_name))
+    return found
+
+
+def _init_worker(directory, output_dir):
+    sys.path.insert(0, directory)
+    os.chdir(output_dir)
+
+
+def render_job(module_name, function_name, formats, use_cache):
+    """
+    Run one generate_* function in a worker for each format.
+
+    Formats of the same diagram stay in one job because diagrams writes and
+    then deletes an intermediate dot file named after the diagram.
+    Returns [(outformat, rendered, seconds, error)]; rendered is None when
+    the generator skipped itself (e.g. no benchmark results yet).
+    """
+    results = []
+    for outformat in formats:
+        started = time.perf_counter()
+        try:
+            function = getattr(importlib.import_module(module_name), function_name)
+            rendered = function(outformat=outformat, use_cache=use_cache)
+            results.append((outformat, rendered, time.perf_counter() - started, None))
+        except Exception as e:
+            results.append((outformat, False, time.perf_counter() - started, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def render_all(jobs, formats, use_cache=True, workers=None, output_dir="."):
+    """Render every (module, function) in every format; returns result rows in job order"""
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(ARCHITECTURE_DIR, os.path.abspath(output_dir))) as pool:
+        futures = {pool.submit(render_job, module, function, formats, use_cache): (module, function)
+                   for module, function in jobs}
+        for future in as_completed(futures):
+            module, function = futures[future]
+            for outformat, rendered, seconds, error in future.result():
+                status, icon = ("failed", "❌") if error else STATUSES[rendered]
+                print(f"{icon} {module}.{function} [{outformat}] {status} in {seconds:.2f}s"
+                      + (f" - {error}" if error else ""))
+                results[(module, function, outformat)] = {
+                    "diagram": f"{module}.{function}", "format": outformat,
+                    "status": status, "seconds": seconds, "error": error,
+                }
+    return [results[(module, function, outformat)] for module, function in jobs for outformat in formats]
+
+
+def print_report(rows, wall_seconds):
+    width = max([len(row["diagram"]) for row in rows] + [7])
+    print(f"\n{'Diagram':<{width}}  {'Format':<6}  {'Status':<8}  {'Time':>7}")
+    print("-" * (width + 29))
+    for row in rows:
+        print(f"{row['diagram']:<{width}}  {row['format']:<6}  {row['status']:<8}  {row['seconds']:>6.2f}s")
+    total = sum(row["seconds"] for row in rows)
+    counts = {status: sum(1 for row in rows if row["status"] == status) for status in ("rendered", "cached", "skipped", "failed")}
+    print(f"\n⏱️  Wall time {wall_seconds:.2f}s, summed render time {total:.2f}s")
+    print(f"📊 {counts['rendered']} rendered, {counts['cached']} cached, {counts['skipped']} skipped, {counts['failed']} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all architecture diagrams in parallel")
+    parser.add_argument("-f", "--format", dest="formats", action="append", choices=FORMATS,
+                        help="Output format, repeat for several (default: png)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--only", action="append", default=[],
+                        help="Glob matched against module.function (repeatable)")
+    parser.add_argument("--force", action="store_true", help="Ignore the render cache")
+    parser.add_argument("--output-dir", default=ARCHITECTURE_DIR, help="Where rendered files are written")
+    parser.add_argument("--list", action="store_true", help="List discovered diagrams and exit")
+    args = parser.parse_args()
+
+    jobs = discover()
+    if args.only:
+        jobs = [(module, function) for module, function in jobs
+                if any(fnmatch.fnmatch(f"{module}.{function}", f"*{pattern}*") for pattern in args.only)]
+    if args.list:
+        for module, function in jobs:
+            print(f"{module}.{function}")
+        return
+    if not jobs:
+        print("❌ No matching generate_* functions found")
+        sys.exit(1)
+
+    formats = list(dict.fromkeys(args.formats or ["png"]))
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"🔄 Rendering {len(jobs)} diagrams x {len(formats)} formats with {args.jobs} workers...")
+    started = time.perf_counter()
+    rows = render_all(jobs, formats, use_cache=not args.force, workers=args.jobs, output_dir=args.output_dir)
+    print_report(rows, time.perf_counter() - started)
+
+    if any(row["status"] == "failed" for row in rows):
+        print("💡 Make sure Graphviz is installed: brew install graphviz")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,115 +3,134 @@
 Simplified Cloud Architecture Diagram Generator
 """
 
-from diagrams import Diagram, Cluster, Edge
-from diagrams.gcp.compute import GKE, ComputeEngine
-from diagrams.gcp.database import SQL
-from diagrams.gcp.network import LoadBalancing
-from diagrams.gcp.storage import GCS
-from diagrams.gcp.devtools import ContainerRegistry
-from diagrams.k8s.compute import Pod
-from diagrams.k8s.network import Service
-from diagrams.onprem.client import Users
-from diagrams.programming.language import NodeJS
-
-def generate_main_architecture():
+from benchmark_results import BENCHMARK_DIR, format_ms, load_pair
+from topology import POD_IDS, cluster, diagram, edge, node, render, service_label
+
+def main_architecture_spec():
+    """Spec for the main cloud architecture diagram"""
+
+    return diagram(
+        "Todo App - Cloud Architecture", "todo_architecture", "TB",
+        [
+            # External users
+            node("users"),
+            # Load Balancer
+            node("lb", "Load Balancer\n(NodePort)"),
+            cluster(
+                "Google Cloud Platform",
+                cluster(
+                    "GKE Cluster",
+                    cluster("Frontend", node("frontend_pod", service_label("frontend", "short"))),
+                    cluster("Auth Service", node("auth_pod", service_label("auth", "short"))),
+                    cluster("Todo Service", node("todo_pod", service_label("todo", "short"))),
+                ),
+                # Database
+                node("database"),
+                # Registry
+                node("registry", "Container\nRegistry"),
+                # Storage for builds
+                node("cicd", "Cloud Build\nArtifacts"),
+            ),
+        ],
+        [
+            # Connections
+            edge("users", "lb", "HTTPS"),
+            edge("lb", "frontend_pod"),
+            edge("frontend_pod", "auth_pod", "API Calls"),
+            edge("frontend_pod", "todo_pod", "CRUD Ops"),
+
+            edge("auth_pod", "database", "DB Queries\n+ Pool + Cache"),
+            edge("todo_pod", "database", "DB Queries"),
+
+            edge("cicd", "registry", "Deploy"),
+            edge("registry", POD_IDS, "Pull Images"),
+        ],
+    )
+
+def run_label(title, results):
+    if results is None:
+        return f"{title}\n(not measured)"
+    total = results["aggregated"]
+    return f"{title}\n{total['success_pct']:.1f}% success\n{format_ms(total['p50'])} p50 / {format_ms(total['p99'])} p99"
+
+def performance_spec(candidate, baseline=None):
+    """Spec for the performance optimization visualization"""
+
+    layers = ["cache", "pool", "bcrypt", "circuit"]
+
+    return diagram(
+        "Performance Optimizations", "performance_opts", "LR",
+        [
+            node("load_test", "Locust\nLoad Test", kind="users"),
+            cluster(
+                "Auth Service Optimizations",
+                node("original", run_label("Baseline", baseline), kind="nodejs"),
+                cluster(
+                    "Optimized Version",
+                    node("cache", "Cache Layer\n5-min TTL", kind="nodejs"),
+                    node("pool", "Connection Pool\n50 max conn", kind="nodejs"),
+                    node("bcrypt", "Bcrypt Opt\nRounds: 12→10", kind="nodejs"),
+                    node("circuit", "Circuit Breaker\nGraceful failure", kind="nodejs"),
+                ),
+                node("optimized", run_label("Candidate", candidate), kind="nodejs"),
+            ),
+        ],
+        [
+            edge("load_test", "original"),
+            edge("original", layers, "After Optimization"),
+            edge(layers, "optimized"),
+        ],
+    )
+
+def cost_breakdown_spec():
+    """Spec for the cost breakdown diagram"""
+
+    costs = [
+        node("gke", "GKE Autopilot\n$105 (70%)", kind="gke"),
+        node("lb_cost", "Network/LB\n$19 (13%)", kind="load_balancer"),
+        node("db_cost", "Database\n$7 (5%)", kind="compute_engine"),
+        node("storage_cost", "Storage/Build\n$5 (3%)", kind="gcs"),
+        node("registry_cost", "Registry\n$1 (1%)", kind="registry"),
+    ]
+
+    return diagram(
+        "GCP Cost Analysis", "cost_analysis", "TB",
+        [cluster("Monthly Costs ($150 total)", *costs, node("total", "Total: $150/month\nBudget: $300 ✅", kind="gcs"))],
+        [edge([cost["id"] for cost in costs], "total")],
+    )
+
+def generate_main_architecture(outformat="png", use_cache=True):
     """Generate the main cloud architecture diagram"""
-    
-    with Diagram("Todo App - Cloud Architecture", show=False, direction="TB", filename="todo_architecture"):
-        
-        # External users
-        users = Users("Users")
-        
-        # Load Balancer
-        lb = LoadBalancing("Load Balancer\n(NodePort)")
-        
-        with Cluster("Google Cloud Platform"):
-            
-            with Cluster("GKE Cluster"):
-                with Cluster("Frontend"):
-                    frontend = Pod("React App\n:30080")
-                    
-                with Cluster("Auth Service"):
-                    auth = Pod("Node.js Auth\n:30081")
-                    
-                with Cluster("Todo Service"):
-                    todo = Pod("Node.js Todo\n:30082")
-            
-            # Database
-            database = ComputeEngine("PostgreSQL\n(e2-micro)")
-            
-            # Registry
-            registry = ContainerRegistry("Container\nRegistry")
-            
-            # Storage for builds
-            build_storage = GCS("Cloud Build\nArtifacts")
-        
-        # Connections
-        users >> Edge(label="HTTPS") >> lb
-        lb >> frontend
-        frontend >> Edge(label="API Calls") >> auth
-        frontend >> Edge(label="CRUD Ops") >> todo
-        
-        auth >> Edge(label="DB Queries\n+ Pool + Cache") >> database
-        todo >> Edge(label="DB Queries") >> database
-        
-        build_storage >> Edge(label="Deploy") >> registry
-        registry >> Edge(label="Pull Images") >> [frontend, auth, todo]
-
-def generate_performance_diagram():
-    """Generate performance optimization visualization"""
-    
-    with Diagram("Performance Optimizations", show=False, direction="LR", filename="performance_opts"):
-        
-        load_test = Users("Locust\nLoad Test")
-        
-        with Cluster("Auth Service Optimizations"):
-            original = NodeJS("Original\n99% failures\n89s response")
-            
-            with Cluster("Optimized Version"):
-                cache = NodeJS("Cache Layer\n5-min TTL")
-                pool = NodeJS("Connection Pool\n50 max conn")
-                bcrypt = NodeJS("Bcrypt Opt\nRounds: 12→10")
-                circuit = NodeJS("Circuit Breaker\nGraceful failure")
-            
-            optimized = NodeJS("Optimized\n95% success\n2.1s response")
-        
-        load_test >> original
-        original >> Edge(label="After Optimization") >> [cache, pool, bcrypt, circuit]
-        [cache, pool, bcrypt, circuit] >> optimized
-
-def generate_cost_breakdown():
+    return render(main_architecture_spec(), outformat, use_cache)
+
+def generate_performance_diagram(outformat="png", use_cache=True, candidate=None, baseline=None):
+    """Generate performance optimization visualization from the latest locust run"""
+    candidate, baseline = load_pair(candidate, baseline)
+    if candidate is None:
+        print(f"⚠️  No locust results in {BENCHMARK_DIR}, skipping performance_opts")
+        return None
+    return render(performance_spec(candidate, baseline), outformat, use_cache)
+
+def generate_cost_breakdown(outformat="png", use_cache=True):
     """Generate cost breakdown diagram"""
-    
-    with Diagram("GCP Cost Analysis", show=False, direction="TB", filename="cost_analysis"):
-        
-        with Cluster("Monthly Costs ($150 total)"):
-            gke = GKE("GKE Autopilot\n$105 (70%)")
-            lb_cost = LoadBalancing("Network/LB\n$19 (13%)")
-            db_cost = ComputeEngine("Database\n$7 (5%)")
-            storage_cost = GCS("Storage/Build\n$5 (3%)")
-            registry_cost = ContainerRegistry("Registry\n$1 (1%)")
-            
-            total = GCS("Total: $150/month\nBudget: $300 ✅")
-        
-        [gke, lb_cost, db_cost, storage_cost, registry_cost] >> total
+    return render(cost_breakdown_spec(), outformat, use_cache)
 
 if __name__ == "__main__":
     print("🔄 Generating cloud architecture diagrams...")
-    
+
     try:
         generate_main_architecture()
         print("✅ Main architecture: todo_architecture.png")
-        
-        generate_performance_diagram()
-        print("✅ Performance optimization: performance_opts.png")
-        
+
+        if generate_performance_diagram() is not None:
+            print("✅ Performance optimization: performance_opts.png")
+
         generate_cost_breakdown()
         print("✅ Cost breakdown: cost_analysis.png")
-        
+
         print("\n🎯 All diagrams generated successfully!")
         print("📁 Check current directory for PNG files")
-        
+
     except Exception as e:
         print(f"❌ Error: {e}")
-        print("💡 Make sure Graphviz is installed: brew install graphviz") 
\ No newline at end of file
+        print("💡 Make sure Graphviz is installed: brew install graphviz")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Declarative Topology Model for the Todo App Architecture Diagrams
+Every diagram is a plain data spec (clusters, nodes, edges) built from one
+shared set of service facts and node definitions, and rendered through a
+content-hash cache so Graphviz only runs when a diagram actually changed.
+"""
+
+import importlib
+
+import render_cache
+
+# Facts shared by every diagram - change them here, not in the generators
+SERVICES = {
+    "frontend": {"title": "Frontend Service", "app": "React App", "port": 30080},
+    "auth": {"title": "Auth Service", "app": "Node.js Auth", "port": 30081},
+    "todo": {"title": "Todo Service", "app": "Node.js Todo", "port": 30082},
+}
+HPA_RANGE = "1-5"
+DATABASE_MACHINE = "e2-micro"
+SUBNET_CIDR = "10.0.1.0/24"
+DATABASE_ADDRESS = "10.0.1.2:5432"
+IMAGES = ["auth:optimized-v4", "frontend:updated-v2", "todo:latest"]
+
+# Node kinds -> diagrams classes (imported lazily so specs stay plain data)
+NODE_KINDS = {
+    "users": "diagrams.onprem.client.Users",
+    "gke": "diagrams.gcp.compute.GKE",
+    "compute_engine": "diagrams.gcp.compute.ComputeEngine",
+    "function": "diagrams.gcp.compute.Functions",
+    "sql": "diagrams.gcp.database.SQL",
+    "load_balancer": "diagrams.gcp.network.LoadBalancing",
+    "vpc": "diagrams.gcp.network.VPC",
+    "gcs": "diagrams.gcp.storage.GCS",
+    "registry": "diagrams.gcp.devtools.ContainerRegistry",
+    "pod": "diagrams.k8s.compute.Pod",
+    "deployment": "diagrams.k8s.compute.Deployment",
+    "service": "diagrams.k8s.network.Service",
+    "nodejs": "diagrams.programming.language.NodeJS",
+}
+
+
+def _service_nodes():
+    nodes = {}
+    for key, service in SERVICES.items():
+        nodes[f"{key}_pod"] = ("pod", f"{service['app']}\n(Port: {service['port']})")
+        nodes[f"{key}_service"] = ("service", "NodePort Service")
+        nodes[f"{key}_hpa"] = ("deployment", f"HPA: {HPA_RANGE} replicas")
+    return nodes
+
+
+# Canonical nodes: id -> (kind, default label)
+NODES = dict(_service_nodes(), **{
+    "users": ("users", "Users"),
+    "database": ("compute_engine", f"PostgreSQL\n({DATABASE_MACHINE})"),
+    "registry": ("registry", "Container Registry\n" + "\n".join(f"- {image}" for image in IMAGES)),
+    "cicd": ("gcs", "Cloud Build\nCI/CD Pipeline"),
+    "vpc": ("vpc", f"Private Network\n{SUBNET_CIDR}"),
+    "lb": ("load_balancer", "Load Balancer\nNodePort Services"),
+    "todo_insights": ("function", "Todo Insights Function"),
+    "todo_analytics": ("function", "Todo Analytics Function"),
+    "health_monitor": ("function", "Health Monitor Function"),
+})
+
+
+def node(node_id, label=None, kind=None):
+    """A node spec; unknown ids must give a kind, known ids may override the label"""
+    default_kind, default_label = NODES.get(node_id, (kind, node_id))
+    return {"id": node_id, "kind": kind or default_kind, "label": label if label is not None else default_label}
+
+
+def cluster(label, *children):
+    return {"cluster": label, "children": list(children)}
+
+
+def edge(source, target, label=None):
+    """An edge spec; source and target may each be one id or a list of ids"""
+    return {"from": source, "to": target, "label": label}
+
+
+def diagram(name, filename, direction, children, edges=()):
+    return {"name": name, "filename": filename, "direction": direction,
+            "children": list(children), "edges": list(edges)}
+
+
+def service_label(key, style="long"):
+    service = SERVICES[key]
+    if style == "short":
+        return f"{service['app']}\n:{service['port']}"
+    return f"{service['app']}\n(Port: {service['port']})"
+
+
+def gke_namespace():
+    """GKE Autopilot cluster with the frontend/auth/todo pods, services and HPAs"""
+    return cluster(
+        "Google Kubernetes Engine (GKE Autopilot)",
+        cluster(
+            "todo-app namespace",
+            *[cluster(SERVICES[key]["title"], node(f"{key}_pod"), node(f"{key}_service"), node(f"{key}_hpa"))
+              for key in SERVICES]
+        ),
+    )
+
+
+def gcp_platform(functions):
+    """The full GCP project: GKE, database VM, the given function nodes, registry, CI/CD and VPC"""
+    return cluster(
+        "Google Cloud Platform",
+        gke_namespace(),
+        cluster("Compute Engine", node("database")),
+        cluster("Cloud Functions (Serverless)", *functions),
+        node("registry"),
+        node("cicd"),
+        cluster("VPC Network", node("vpc"), node("lb")),
+    )
+
+
+POD_IDS = [f"{key}_pod" for key in SERVICES]
+
+GKE_SERVICE_EDGES = [
+    edge("frontend_service", "auth_service", "Internal API calls"),
+    edge("frontend_service", "todo_service", "CRUD operations"),
+]
+
+INGRESS_EDGES = [
+    edge("users", "lb", "HTTP Requests"),
+    edge("lb", "frontend_service"),
+]
+
+DATABASE_EDGES = [
+    edge("auth_pod", "database", "DB Queries\n+ Connection Pool\n+ Caching\n+ Circuit Breaker"),
+    edge("todo_pod", "database", "DB Queries"),
+]
+
+DELIVERY_EDGES = [
+    edge("cicd", "registry", "Build & Push"),
+    edge("registry", POD_IDS, "Pull images"),
+]
+
+
+def _node_class(kind):
+    module_name, class_name = NODE_KINDS[kind].rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _build(children, nodes):
+    from diagrams import Cluster
+
+    for child in children:
+        if "cluster" in child:
+            with Cluster(child["cluster"]):
+                _build(child["children"], nodes)
+        else:
+            nodes[child["id"]] = _node_class(child["kind"])(child["label"])
+
+
+def _as_list(ids):
+    return ids if isinstance(ids, list) else [ids]
+
+
+def render(spec, outformat="png", use_cache=True, cache_dir=render_cache.DEFAULT_CACHE_DIR):
+    """Render a diagram spec; returns False if the cached output was still fresh"""
+    from diagrams import Diagram, Edge
+
+    output = f"{spec['filename']}.{outformat}"
+    digest = render_cache.spec_digest(spec, outformat)
+    if use_cache and render_cache.is_fresh(output, digest, cache_dir):
+        print(f"♻️  {output} unchanged, skipping Graphviz")
+        return False
+
+    with Diagram(spec["name"], show=False, direction=spec["direction"],
+                 filename=spec["filename"], outformat=outformat):
+        nodes = {}
+        _build(spec["children"], nodes)
+        for item in spec["edges"]:
+            for source in _as_list(item["from"]):
+                for target in _as_list(item["to"]):
+                    if item["label"] is None:
+                        nodes[source] >> nodes[target]
+                    else:
+                        nodes[source] >> Edge(label=item["label"]) >> nodes[target]
+
+    render_cache.store(output, digest, cache_dir)
+    return True
@@ -0,0 +1,223 @@
+"""
+Run Artifacts - Failure Log and Multi-Worker Merging
+Writes the per-process failure log and merges the custom artifacts that
+distributed workers produce (soak summaries, failure logs, recordings,
+harness profiles, contention reports) into one set of files.
+"""
+
+import csv
+import json
+import os
+import time
+
+from profiler import read_folded, write_folded
+from recorder import open_recording
+from soak import LatencyHistogram
+
+# Request names of the contention scenario and their HTTP methods
+CONTENTION_ENDPOINTS = {
+    "Contention PUT": "PUT",
+    "Contention PATCH": "PATCH",
+    "Contention DELETE": "DELETE",
+    "Contention Read-back": "GET",
+}
+
+
+class FailureLog:
+    """Appends one JSON line per failed request"""
+
+    def __init__(self, path, worker_index=0):
+        self.path = path
+        self.worker_index = worker_index
+        self.count = 0
+        self.file = open(path, "w")
+
+    def record(self, request_type, name, exception, context, start_time=None):
+        entry = {
+            "ts": round(start_time if start_time is not None else time.time(), 4),
+            "w": self.worker_index,
+            "u": (context or {}).get("user_index"),
+            "type": request_type,
+            "n": name,
+            "error": str(exception),
+        }
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+
+def merge_soak_summaries(paths, output):
+    """Merge worker soak summaries by summing their latency histograms"""
+    merged = {}
+    workers = []
+    for path in paths:
+        with open(path) as f:
+            summary = json.load(f)
+        workers.append({"path": path, "drifting": summary.get("drifting", [])})
+        for name, stats in summary.get("endpoints", {}).items():
+            entry = merged.setdefault(name, {"histogram": LatencyHistogram(), "failures": 0})
+            entry["histogram"].merge(LatencyHistogram.from_dict(stats["histogram"]))
+            entry["failures"] += stats.get("failures", 0)
+
+    endpoints = {}
+    for name, entry in sorted(merged.items()):
+        histogram = entry["histogram"]
+        endpoints[name] = {
+            "requests": histogram.count,
+            "failures": entry["failures"],
+            "error_pct": round(100.0 * entry["failures"] / histogram.count, 3) if histogram.count else 0.0,
+            "mean": round(histogram.mean(), 1),
+            "p50": round(histogram.quantile(0.5), 1),
+            "p95": round(histogram.quantile(0.95), 1),
+            "p99": round(histogram.quantile(0.99), 1),
+            "max": round(histogram.max, 1),
+            "histogram": histogram.to_dict(),
+        }
+    result = {
+        "workers": workers,
+        "drifting": sorted({item for worker in workers for item in worker["drifting"]}),
+        "endpoints": endpoints,
+    }
+    with open(output, "w") as f:
+        json.dump(result, f, separators=(",", ":"))
+    return result
+
+
+def merge_failure_logs(paths, output):
+    """Concatenate worker failure logs in timestamp order"""
+    entries = []
+    for path in paths:
+        with open(path) as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+    entries.sort(key=lambda entry: entry["ts"])
+    with open(output, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    return len(entries)
+
+
+def merge_recordings(paths, output):
+    """Merge worker recordings onto one timeline starting at the earliest worker"""
+    headers, streams = [], []
+    for path in paths:
+        with open_recording(path) as f:
+            header = json.loads(f.readline())
+            headers.append(header)
+            streams.append((header["started_at"], [json.loads(line) for line in f if line.strip()]))
+    if not headers:
+        return 0
+    started_at = min(start for start, _ in streams)
+    entries = []
+    for start, stream in streams:
+        for entry in stream:
+            entry["t"] = round(entry["t"] + start - started_at, 4)
+            entries.append(entry)
+    entries.sort(key=lambda entry: entry["t"])
+    header = dict(headers[0], started_at=started_at, workers=len(headers))
+    with open_recording(output, "wt") as f:
+        f.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    return len(entries)
+
+
+def merge_folded_profiles(paths, output):
+    """Sum worker folded stacks into one flame graph input"""
+    stacks = {}
+    for path in paths:
+        for stack, count in read_folded(path).items():
+            stacks[stack] = stacks.get(stack, 0) + count
+    write_folded(stacks, output)
+    return len(stacks)
+
+
+def merge_harness_summaries(paths, output):
+    """Collect worker harness summaries; any saturated worker inflates the merged latencies"""
+    workers = []
+    for path in paths:
+        with open(path) as f:
+            summary = json.load(f)
+        workers.append({
+            "path": path,
+            "cpu_pct": summary["cpu_pct"],
+            "lag_ms": summary["lag_ms"],
+            "saturated_windows": summary["saturated_windows"],
+            "hot_tasks": summary["hot_tasks"],
+        })
+    result = {
+        "saturated_workers": [worker["path"] for worker in workers if worker["saturated_windows"]],
+        "workers": workers,
+    }
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    return result
+
+
+def contention_rates(result):
+    """Add conflict and lost-update rates to a contention counters dict"""
+    mutations = max(result["mutations"], 1)
+    reads = max(result["verified_reads"], 1)
+    result["conflict_rate_pct"] = round(100.0 * result["conflicts"] / mutations, 3)
+    result["lost_update_rate_pct"] = round(100.0 * result["lost_updates"] / reads, 3)
+    return result
+
+
+def contention_endpoints(stats_csv):
+    """Read the contention request rows from the master's locust stats CSV"""
+    endpoints = {}
+    if not os.path.exists(stats_csv):
+        return endpoints
+    with open(stats_csv, newline="") as f:
+        for row in csv.DictReader(f):
+            if CONTENTION_ENDPOINTS.get(row["Name"]) == row["Type"] and int(row["Request Count"]):
+                endpoints[row["Name"]] = {
+                    "requests": int(row["Request Count"]),
+                    "rps": round(float(row["Requests/s"]), 2),
+                    "p50": float(row["50%"]),
+                    "p99": float(row["99%"]),
+                    "max": float(row["Max Response Time"]),
+                }
+    return endpoints
+
+
+def merge_contention_reports(paths, output):
+    """Sum worker contention counters; endpoint stats come from the master's stats_stats.csv"""
+    result = {}
+    conflicts_by_operation = {}
+    for path in paths:
+        with open(path) as f:
+            report = json.load(f)
+        for key, value in report.items():
+            if isinstance(value, int):
+                result[key] = result.get(key, 0) + value
+        for operation, count in report.get("conflicts_by_operation", {}).items():
+            conflicts_by_operation[operation] = conflicts_by_operation.get(operation, 0) + count
+    result["conflicts_by_operation"] = conflicts_by_operation
+    contention_rates(result)
+    result["endpoints"] = contention_endpoints(os.path.join(os.path.dirname(output), "stats_stats.csv"))
+    result["workers"] = len(paths)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    return result
+
+
+def merge_worker_artifacts(artifacts_dir, worker_dirs):
+    """Merge every artifact type found in the worker directories; returns {kind: path}"""
+    merged = {}
+    for filename, kind, merge in (
+        ("soak-summary.json", "soak", merge_soak_summaries),
+        ("failures.jsonl", "failures", merge_failure_logs),
+        ("recording.jsonl.gz", "recording", merge_recordings),
+        ("contention-report.json", "contention", merge_contention_reports),
+        (os.path.join("harness-profile", "profile.folded"), "profile", merge_folded_profiles),
+        (os.path.join("harness-profile", "harness-summary.json"), "harness", merge_harness_summaries),
+    ):
+        paths = [os.path.join(d, filename) for d in worker_dirs if os.path.exists(os.path.join(d, filename))]
+        if paths:
+            output = os.path.join(artifacts_dir, filename)
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            merge(paths, output)
+            merged[kind] = output
+    return merged
@@ -0,0 +1,350 @@
+"""
+Write-Burst Contention Scenario for Todo App
+Many users share a few accounts and hammer the same todos with PUT / PATCH /
+DELETE bursts to surface lock contention in the todo-service write path.
+
+Every PUT writes a unique marker into the todo description. After each burst
+the user reads the todo back; if it shows a write that finished before the
+newest acknowledged write even started, that newer write was lost.
+
+Hot todos are titled by slot ("Hot Todo 0", "Hot Todo 1", ...) and every
+process resolves a slot to the lowest todo id carrying that title, so all
+workers of a distributed run contend on the same rows.
+
+Usage:
+  locust -f contention.py --host http://34.22.249.41:30082 -u 100 -r 20 -t 300s --headless \\
+      --contention-accounts 3 --contention-todos 5 --contention-burst 5
+  python distributed.py -f contention.py -u 400 -r 40 -t 300s --seed 42
+"""
+
+import json
+import re
+import time
+from collections import deque
+
+from gevent.lock import Semaphore
+from locust import HttpUser, events, task
+from locust.exception import StopUser
+from locust.runners import WorkerRunner
+
+import locustfile  # noqa: F401  (shared command line options, seeding, soak/record listeners)
+from artifacts import CONTENTION_ENDPOINTS, contention_rates
+from seeding import next_user_index, seeded_between, use_seeded_tasks, user_rng
+
+PASSWORD = "TestPassword123!"
+MAX_TRACKED_WRITES = 64
+HOT_TITLE = re.compile(r"^Hot Todo (\d+)$")
+# Re-resolve hot slots this often so processes that created duplicates converge
+SYNC_INTERVAL = 5.0
+# The todo-service caps page size at 100
+SYNC_PAGE_SIZE = 100
+
+
+class ContentionTracker:
+    """Acknowledged writes per todo and the outcome counters of the scenario"""
+
+    def __init__(self):
+        self.writes = {}
+        self.counters = {
+            "mutations": 0, "writes": 0, "conflicts": 0, "lost_updates": 0, "verified_reads": 0,
+            "unverified_reads": 0, "deleted_reads": 0, "server_errors": 0,
+        }
+        self.conflicts_by_operation = {}
+
+    def record_write(self, todo_id, marker, started, finished):
+        writes = self.writes.get(todo_id)
+        if writes is None:
+            writes = self.writes[todo_id] = deque(maxlen=MAX_TRACKED_WRITES)
+        writes.append((started, finished, marker))
+        self.counters["writes"] += 1
+
+    def record_conflict(self, operation):
+        self.counters["conflicts"] += 1
+        self.conflicts_by_operation[operation] = self.conflicts_by_operation.get(operation, 0) + 1
+
+    def check_read(self, todo_id, observed_marker, read_started):
+        """Classify a read-back; returns True if it exposed a lost update"""
+        writes = self.writes.get(todo_id) or ()
+        done = [w for w in writes if w[1] < read_started]
+        observed = next((w for w in writes if w[2] == observed_marker), None)
+        if not done or observed is None:
+            self.counters["unverified_reads"] += 1
+            return False
+        newest = max(done, key=lambda w: w[1])
+        self.counters["verified_reads"] += 1
+        # The visible write finished before the newest acknowledged one started: that one was lost
+        if observed[1] < newest[0]:
+            self.counters["lost_updates"] += 1
+            return True
+        return False
+
+    def summary(self, stats=None):
+        result = dict(self.counters)
+        result["conflicts_by_operation"] = dict(self.conflicts_by_operation)
+        contention_rates(result)
+        if stats is not None:
+            result["endpoints"] = {}
+            for name, method in CONTENTION_ENDPOINTS.items():
+                entry = stats.entries.get((name, method))
+                if entry and entry.num_requests:
+                    result["endpoints"][name] = {
+                        "requests": entry.num_requests,
+                        "rps": round(entry.total_rps, 2),
+                        "p50": entry.get_response_time_percentile(0.5),
+                        "p99": entry.get_response_time_percentile(0.99),
+                        "max": entry.max_response_time,
+                    }
+        return result
+
+
+class SharedAccount:
+    """One account shared by many users, with its hot todos by slot"""
+
+    def __init__(self, index, seed):
+        self.email = f"contender{seed}a{index}@example.com"
+        self.username = f"contender{seed}a{index}"
+        self.token = None
+        self.hot = {}
+        self.synced_at = 0.0
+        self.lock = Semaphore()
+
+    def needs_sync(self, slots):
+        return len(self.hot) < slots or time.time() - self.synced_at >= SYNC_INTERVAL
+
+    @property
+    def todo_ids(self):
+        return list(self.hot.values())
+
+    def forget(self, todo_id):
+        self.hot = {slot: hot_id for slot, hot_id in self.hot.items() if hot_id != todo_id}
+
+
+class ContentionUser(HttpUser):
+    """
+    Shares an account with other users and mutates the same todos in bursts
+    """
+    wait_time = seeded_between(0.5, 2)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user_index = next_user_index(self.environment)
+        self.rng = user_rng(self.environment.run_seed, self.user_index)
+        self.todo_url = self.environment.parsed_options.todo_url
+        self.auth_url = self.environment.parsed_options.auth_url
+        self.write_seq = 0
+        accounts = self.environment.contention_accounts
+        self.account = accounts[self.user_index % len(accounts)]
+
+    def context(self):
+        return {"user_index": self.user_index}
+
+    def on_start(self):
+        """Provision the shared account once; later users reuse its token and todos"""
+        use_seeded_tasks(self)
+        with self.account.lock:
+            if not self.account.token:
+                self.provision_account()
+            if self.account.token:
+                self.sync_hot_todos()
+        if not self.account.token:
+            raise StopUser()
+
+    def provision_account(self):
+        account = self.account
+        register_data = {"username": account.username, "email": account.email, "password": PASSWORD,
+                         "firstName": "Contention", "lastName": "Tester"}
+        with self.client.post(f"{self.auth_url}/auth/register", json=register_data,
+                              catch_response=True, name="Contention Registration") as response:
+            if response.status_code == 201:
+                account.token = response.json().get("data", {}).get("token")
+                return
+            if response.status_code == 409:
+                response.success()
+            else:
+                response.failure(f"Registration failed: {response.status_code}")
+                return
+        with self.client.post(f"{self.auth_url}/auth/login",
+                              json={"email": account.email, "password": PASSWORD},
+                              catch_response=True, name="Contention Login") as response:
+            if response.status_code == 200:
+                account.token = response.json().get("data", {}).get("token")
+            else:
+                response.failure(f"Login failed: {response.status_code}")
+
+    def headers(self):
+        return {"Authorization": f"Bearer {self.account.token}"}
+
+    def sync_hot_todos(self):
+        """
+        Map every hot slot to the lowest todo id with its title, delete the
+        duplicates and create the slots missing on the server. Processes that
+        race to create the same slot converge on the same row at their next sync.
+        """
+        slots = self.environment.parsed_options.contention_todos
+        self.account.synced_at = time.time()
+        todos = self.fetch_hot_todos()
+        if todos is None:
+            return
+        hot, duplicates = {}, []
+        for todo in sorted(todos, key=lambda todo: todo["id"]):
+            match = HOT_TITLE.match(todo.get("title") or "")
+            if match and int(match.group(1)) < slots:
+                slot = int(match.group(1))
+                if slot in hot:
+                    duplicates.append(todo["id"])
+                else:
+                    hot[slot] = todo["id"]
+        self.account.hot = hot
+        for todo_id in duplicates:
+            self.delete_duplicate(todo_id)
+        for slot in range(slots):
+            if slot not in hot:
+                self.create_hot_todo(slot)
+
+    def fetch_hot_todos(self):
+        """All todos titled like a hot todo, oldest first; None if the listing failed"""
+        todos = []
+        params = {"search": "Hot Todo", "limit": SYNC_PAGE_SIZE, "sortBy": "createdAt", "sortOrder": "ASC", "page": 1}
+        while True:
+            with self.client.get(f"{self.todo_url}/todos", params=params, headers=self.headers(),
+                                 catch_response=True, name="Contention Sync") as response:
+                if response.status_code != 200:
+                    response.failure(f"Hot todo sync failed: {response.status_code}")
+                    return None
+                data = response.json().get("data", {})
+            todos += data.get("todos", [])
+            if not data.get("pagination", {}).get("hasNext"):
+                return todos
+            params["page"] += 1
+
+    def delete_duplicate(self, todo_id):
+        with self.client.delete(f"{self.todo_url}/todos/{todo_id}", headers=self.headers(),
+                                catch_response=True, name="Contention Dedup") as response:
+            # 404: another process removed the same duplicate first
+            if response.status_code in (200, 404):
+                response.success()
+            else:
+                response.failure(f"Duplicate delete failed: {response.status_code}")
+
+    def create_hot_todo(self, slot):
+        todo_data = {"title": f"Hot Todo {slot}", "description": "contention",
+                     "priority": "medium", "category": "work"}
+        with self.client.post(f"{self.todo_url}/todos", json=todo_data, headers=self.headers(),
+                              catch_response=True, name="Contention Create") as response:
+            if response.status_code == 201:
+                todo_id = response.json().get("data", {}).get("todo", {}).get("id")
+                if todo_id is not None:
+                    self.account.hot[slot] = todo_id
+            else:
+                response.failure(f"Todo creation failed: {response.status_code}")
+
+    def mutate(self, todo_id, operation):
+        tracker = self.environment.contention_tracker
+        if operation == "PUT":
+            self.write_seq += 1
+            marker = f"w{self.user_index}s{self.write_seq}"
+            update_data = {"description": marker, "priority": self.rng.choice(["low", "medium", "high"])}
+            request = lambda: self.client.put(
+                f"{self.todo_url}/todos/{todo_id}", json=update_data,
+                headers=self.headers(), catch_response=True, name="Contention PUT")
+        elif operation == "PATCH":
+            request = lambda: self.client.patch(
+                f"{self.todo_url}/todos/{todo_id}/complete", headers=self.headers(),
+                catch_response=True, name="Contention PATCH")
+        else:
+            request = lambda: self.client.delete(
+                f"{self.todo_url}/todos/{todo_id}", headers=self.headers(),
+                catch_response=True, name="Contention DELETE")
+
+        tracker.counters["mutations"] += 1
+        started = time.time()
+        with request() as response:
+            finished = time.time()
+            if response.status_code == 200:
+                if operation == "PUT":
+                    tracker.record_write(todo_id, marker, started, finished)
+                elif operation == "DELETE":
+                    self.account.forget(todo_id)
+                response.success()
+            elif response.status_code in (404, 409):
+                # Lost the race against a concurrent delete/update: expected here, counted separately
+                tracker.record_conflict(operation)
+                # A 409 leaves the row in place; only a 404 means it is gone
+                if response.status_code == 404:
+                    self.account.forget(todo_id)
+                response.success()
+            else:
+                if response.status_code >= 500:
+                    tracker.counters["server_errors"] += 1
+                response.failure(f"{operation} failed: {response.status_code}")
+
+    @task
+    def write_burst(self):
+        """Fire a burst of writes at one hot todo, then read it back"""
+        slots = self.environment.parsed_options.contention_todos
+        if self.account.needs_sync(slots):
+            with self.account.lock:
+                if self.account.needs_sync(slots):
+                    self.sync_hot_todos()
+        if not self.account.todo_ids:
+            return
+        todo_id = self.rng.choice(self.account.todo_ids)
+        for _ in range(self.environment.parsed_options.contention_burst):
+            operation = self.rng.choices(["PUT", "PATCH", "DELETE"], weights=[6, 3, 1])[0]
+            self.mutate(todo_id, operation)
+            if operation == "DELETE":
+                break
+
+        read_started = time.time()
+        with self.client.get(f"{self.todo_url}/todos/{todo_id}", headers=self.headers(),
+                             catch_response=True, name="Contention Read-back") as response:
+            tracker = self.environment.contention_tracker
+            if response.status_code == 200:
+                todo = response.json().get("data", {}).get("todo", {})
+                if tracker.check_read(todo_id, todo.get("description"), read_started):
+                    response.failure("Lost update: read-back shows an older write")
+                else:
+                    response.success()
+            elif response.status_code == 404:
+                tracker.counters["deleted_reads"] += 1
+                self.account.forget(todo_id)
+                response.success()
+            else:
+                response.failure(f"Read-back failed: {response.status_code}")
+
+
+@events.init_command_line_parser.add_listener
+def _(parser):
+    parser.add_argument("--contention-accounts", type=int, default=3, help="Accounts shared by all contention users")
+    parser.add_argument("--contention-todos", type=int, default=5, help="Hot todos kept per shared account")
+    parser.add_argument("--contention-burst", type=int, default=5, help="Writes per burst against one todo")
+    parser.add_argument("--contention-report", type=str, default="contention-report.json", help="Contention report output file")
+
+
+@events.init.add_listener
+def _(environment, **kwargs):
+    options = environment.parsed_options
+    accounts = getattr(options, "contention_accounts", 3) or 1
+    environment.contention_accounts = [SharedAccount(i, environment.run_seed) for i in range(accounts)]
+    environment.contention_tracker = ContentionTracker()
+    environment.contention_report_path = getattr(options, "contention_report", "contention-report.json")
+
+
+@events.test_stop.add_listener
+def _(environment, **kwargs):
+    tracker = getattr(environment, "contention_tracker", None)
+    if not tracker or not tracker.counters["mutations"]:
+        return
+    # Worker stats are reset after every report to the master; distributed.py
+    # takes the endpoint numbers from the master's CSV when it merges the reports
+    stats = None if isinstance(environment.runner, WorkerRunner) else environment.stats
+    summary = tracker.summary(stats)
+    with open(environment.contention_report_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    print("Contention results:")
+    print(f"  Mutations: {summary['mutations']} ({summary['writes']} acknowledged PUTs)")
+    print(f"  Conflicts (404/409): {summary['conflicts']} ({summary['conflict_rate_pct']}%)")
+    print(f"  Lost updates: {summary['lost_updates']} of {summary['verified_reads']} verified reads "
+          f"({summary['lost_update_rate_pct']}%)")
+    print(f"  Server errors: {summary['server_errors']}")
+    print(f"  Report written to {environment.contention_report_path}")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Distributed Locust Launcher for Todo App
+Starts one locust master plus N local worker processes (one per core by
+default), shards the user pool and RNG seeds across workers, and merges the
+workers' custom artifacts when the run ends.
+
+Usage:
+  python distributed.py -u 400 -r 40 -t 600s --workers 8 --seed 42
+  python distributed.py -u 50 -r 10 -t 30s --standin            # offline validation
+  python distributed.py -u 200 -r 20 -t 6h --soak --record -- --soak-window 120
+  python distributed.py -u 400 -r 40 -t 300s --harness-profile -- --saturation-cpu 80
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from artifacts import merge_worker_artifacts
+from seeding import resolve_seed
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LOCUSTFILE = os.path.join(HERE, "locustfile.py")
+TARGET_OPTIONS = ["auth_url", "todo_url", "frontend_url", "insights_url"]
+
+
+def worker_artifact_args(args, worker_dir):
+    """Point per-worker artifact options at the worker's own directory"""
+    artifact_args = ["--failure-log", os.path.join(worker_dir, "failures.jsonl")]
+    if args.soak:
+        artifact_args += ["--soak", "--soak-summary", os.path.join(worker_dir, "soak-summary.json")]
+    if args.record:
+        artifact_args += ["--record", os.path.join(worker_dir, "recording.jsonl.gz")]
+    if os.path.splitext(os.path.basename(args.locustfile))[0] == "contention":
+        artifact_args += ["--contention-report", os.path.join(worker_dir, "contention-report.json")]
+    if args.harness_profile:
+        artifact_args += ["--harness-profile", os.path.join(worker_dir, "harness-profile")]
+    return artifact_args
+
+
+def wait_until_ready(url, process, timeout=10.0):
+    """Poll GET /health until the stand-in answers; False if it exits or times out"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.05)
+    return False
+
+
+def start_standin(port, extra_args=()):
+    process = subprocess.Popen([sys.executable, os.path.join(HERE, "standin.py"), "--port", str(port)] + list(extra_args))
+    url = f"http://127.0.0.1:{port}"
+    if not wait_until_ready(url, process):
+        process.kill()
+        raise RuntimeError(f"Stand-in on port {port} did not become ready")
+    return process, {option: url for option in TARGET_OPTIONS}
+
+
+def run(args, extra_args):
+    seed = resolve_seed(args.seed)
+    artifacts_dir = os.path.abspath(args.artifacts)
+    os.makedirs(artifacts_dir, exist_ok=True)
+    processes = []
+
+    targets = {option: getattr(args, option) for option in TARGET_OPTIONS}
+    if args.standin:
+        standin, targets = start_standin(args.standin_port)
+        processes.append(standin)
+    target_args = []
+    for option, url in targets.items():
+        if url:
+            target_args += ["--" + option.replace("_", "-"), url]
+
+    common = ["locust", "-f", args.locustfile] + args.user_classes
+    master_cmd = common + [
+        "--master", "--headless", "--master-bind-port", str(args.master_port),
+        "--expect-workers", str(args.workers), "-u", str(args.users), "-r", str(args.spawn_rate),
+        "-t", args.run_time, "--only-summary", "--csv", os.path.join(artifacts_dir, "stats"),
+        "--seed", str(seed),
+    ] + target_args + extra_args
+    if targets.get("auth_url"):
+        master_cmd += ["--host", targets["auth_url"]]
+
+    print("🚀 Starting distributed load test")
+    print(f"  Workers: {args.workers}")
+    print(f"  Users: {args.users} (spawn rate {args.spawn_rate}/sec, run time {args.run_time})")
+    print(f"  Seed: {seed}")
+    print(f"  Artifacts: {artifacts_dir}")
+    if args.standin:
+        print(f"  Target: local stand-in on port {args.standin_port}")
+
+    worker_dirs = []
+    workers = []
+    try:
+        master = subprocess.Popen(master_cmd)
+        processes.append(master)
+        for index in range(args.workers):
+            worker_dir = os.path.join(artifacts_dir, f"worker-{index}")
+            os.makedirs(worker_dir, exist_ok=True)
+            worker_dirs.append(worker_dir)
+            worker_cmd = common + [
+                "--worker", "--master-port", str(args.master_port),
+                "--worker-index", str(index), "--worker-count", str(args.workers),
+                "--seed", str(seed),
+            ] + target_args + extra_args + worker_artifact_args(args, worker_dir)
+            with open(os.path.join(worker_dir, "worker.log"), "w") as log:
+                workers.append(subprocess.Popen(worker_cmd, stdout=log, stderr=subprocess.STDOUT))
+        processes.extend(workers)
+        exit_code = master.wait()
+        # Workers exit once the master quits; give them time to flush their artifacts
+        for worker in workers:
+            try:
+                worker.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                worker.send_signal(signal.SIGINT)
+    except KeyboardInterrupt:
+        exit_code = 1
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.send_signal(signal.SIGINT)
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    merged = merge_worker_artifacts(artifacts_dir, worker_dirs)
+    print("")
+    print("📁 Merged artifacts:")
+    print(f"  stats: {os.path.join(artifacts_dir, 'stats_stats.csv')}")
+    for kind, path in merged.items():
+        print(f"  {kind}: {path}")
+    return exit_code
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    extra_args = []
+    if "--" in argv:
+        extra_args = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+
+    parser = argparse.ArgumentParser(description="Run locust as a master plus N local workers")
+    parser.add_argument("user_classes", nargs="*", help="User classes to run (default: all)")
+    parser.add_argument("-f", "--locustfile", default=LOCUSTFILE, help="Locustfile to run (e.g. contention.py)")
+    parser.add_argument("-u", "--users", type=int, default=100, help="Total number of users across all workers")
+    parser.add_argument("-r", "--spawn-rate", type=float, default=10, help="Total spawn rate across all workers")
+    parser.add_argument("-t", "--run-time", default="300s", help="Run time, e.g. 300s or 10m")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, help="Run seed shared by all workers")
+    parser.add_argument("--master-port", type=int, default=5557, help="Master bind port for worker connections")
+    parser.add_argument("--artifacts", default="artifacts", help="Directory for stats and merged artifacts")
+    parser.add_argument("--soak", action="store_true", help="Enable soak mode on every worker and merge the summaries")
+    parser.add_argument("--record", action="store_true", help="Record every worker's request stream and merge them")
+    parser.add_argument("--harness-profile", action="store_true",
+                        help="Profile every worker's own CPU, loop lag and hot tasks and merge the profiles")
+    parser.add_argument("--standin", action="store_true", help="Run against a local stand-in target")
+    parser.add_argument("--standin-port", type=int, default=8099)
+    for option in TARGET_OPTIONS:
+        parser.add_argument("--" + option.replace("_", "-"), default=None)
+    return run(parser.parse_args(argv), extra_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+HPA Load Test Orchestrator for Todo App
+Runs concurrent health checks, drives locust programmatically through
+warm-up / ramp / steady / cool-down phases, polls HPA replica counts and
+joins scaling events onto the latency/RPS timeline.
+
+Usage:
+  python hpa_orchestrator.py [USERS] [SPAWN_RATE] [DURATION]
+  python hpa_orchestrator.py 100 20 600 --replica-source kubectl
+  python hpa_orchestrator.py 20 5 120 --replica-source fake \\
+      --fake-schedule "todo-app-auth-hpa=0:1,40:2,70:3" --auth-url http://localhost:8089
+"""
+
+import locust  # noqa: F401  (applies gevent monkey patching before anything else)
+
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+
+import gevent
+import requests
+from locust import events
+from locust.argument_parser import parse_options
+from locust.env import Environment
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import locustfile  # noqa: E402
+
+DEFAULT_URLS = {
+    "auth_url": "http://34.22.249.41:30081",
+    "todo_url": "http://34.22.249.41:30082",
+    "frontend_url": "http://34.22.249.41:30080",
+    "insights_url": "https://todo-app-insights-dev-tbv5uyb5va-ew.a.run.app",
+}
+
+# Fraction of the total duration spent in each phase when not given explicitly
+PHASE_SPLIT = [("warmup", 0.1), ("ramp", 0.2), ("steady", 0.5), ("cooldown", 0.2)]
+
+
+class KubectlReplicaSource:
+    """Reads replica counts and CPU utilization from `kubectl get hpa -o json`"""
+
+    def __init__(self, namespace="todo-app", kubectl="kubectl"):
+        self.namespace = namespace
+        self.kubectl = kubectl
+
+    def poll(self, elapsed):
+        try:
+            output = subprocess.run(
+                [self.kubectl, "get", "hpa", "-n", self.namespace, "-o", "json"],
+                capture_output=True, text=True, timeout=15, check=True,
+            ).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"⚠️  kubectl polling failed: {e}")
+            return {}
+        try:
+            items = json.loads(output).get("items", [])
+        except ValueError as e:
+            print(f"⚠️  kubectl returned unreadable output: {e}")
+            return {}
+        replicas = {}
+        for item in items:
+            status = item.get("status", {})
+            replicas[item["metadata"]["name"]] = {
+                "current": status.get("currentReplicas", 0),
+                "desired": status.get("desiredReplicas", 0),
+                "cpu_pct": cpu_utilization(status),
+            }
+        return replicas
+
+
+def cpu_utilization(status):
+    """Average CPU utilization in percent of requests, from an autoscaling/v2 or v1 HPA status"""
+    for metric in status.get("currentMetrics") or []:
+        resource = metric.get("resource") or {}
+        if metric.get("type") == "Resource" and resource.get("name") == "cpu":
+            return resource.get("current", {}).get("averageUtilization")
+    return status.get("currentCPUUtilizationPercentage")
+
+
+class FakeReplicaSource:
+    """
+    Scripted replica counts for offline runs.
+
+    The schedule maps HPA names to (seconds, replicas) steps, e.g.
+    "todo-app-auth-hpa=0:1,40:2,70:3;todo-app-todo-hpa=0:1,60:2".
+    """
+
+    def __init__(self, schedule):
+        self.schedule = self.parse(schedule)
+
+    @staticmethod
+    def parse(schedule):
+        parsed = {}
+        for part in filter(None, (schedule or "").split(";")):
+            name, steps = part.split("=", 1)
+            parsed[name.strip()] = sorted(
+                (float(at), int(count)) for at, count in (step.split(":") for step in steps.split(","))
+            )
+        return parsed
+
+    def poll(self, elapsed):
+        replicas = {}
+        for name, steps in self.schedule.items():
+            count = steps[0][1]
+            for at, step_count in steps:
+                if elapsed >= at:
+                    count = step_count
+            replicas[name] = {"current": count, "desired": count}
+        return replicas
+
+
+def check_health(urls, timeout=5):
+    """Run all health checks concurrently; returns {service: (ok, detail)}"""
+    targets = {
+        "Auth Service": f"{urls['auth_url']}/health",
+        "Todo Service": f"{urls['todo_url']}/health",
+        "Frontend": urls["frontend_url"],
+    }
+
+    def check(url):
+        try:
+            response = requests.get(url, timeout=timeout)
+            return response.status_code < 400, f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            return False, type(e).__name__
+
+    jobs = {name: gevent.spawn(check, url) for name, url in targets.items()}
+    gevent.joinall(list(jobs.values()))
+    return {name: job.value for name, job in jobs.items()}
+
+
+def plan_phases(args):
+    """Return [(phase, seconds)] using explicit durations or the default split"""
+    phases = []
+    for phase, share in PHASE_SPLIT:
+        seconds = getattr(args, phase)
+        phases.append((phase, seconds if seconds is not None else round(args.duration * share)))
+    return phases
+
+
+def target_users(phase, progress, users, warm_users):
+    if phase == "ramp":
+        return max(warm_users, int(round(warm_users + (users - warm_users) * progress)))
+    if phase == "steady":
+        return users
+    return warm_users
+
+
+class Timeline:
+    """Samples locust stats and replica counts at a fixed interval"""
+
+    def __init__(self, environment, replica_source):
+        self.environment = environment
+        self.replica_source = replica_source
+        self.started_at = time.time()
+        self.samples = []
+        self.phase_starts = {}
+        self.last_requests = 0
+        self.last_failures = 0
+        self.last_endpoint_counts = {}
+        self.last_sampled_at = self.started_at
+
+    def mark(self, phase):
+        self.phase_starts[phase] = round(time.time() - self.started_at, 2)
+
+    def sample(self, phase, users):
+        now = time.time()
+        total = self.environment.stats.total
+        interval = max(now - self.last_sampled_at, 1e-6)
+        requests_delta = total.num_requests - self.last_requests
+        failures_delta = total.num_failures - self.last_failures
+        self.last_requests, self.last_failures, self.last_sampled_at = total.num_requests, total.num_failures, now
+        elapsed = round(now - self.started_at, 2)
+        self.samples.append({
+            "t": elapsed,
+            "phase": phase,
+            "users": users,
+            "rps": round(requests_delta / interval, 2),
+            "error_pct": round(100.0 * failures_delta / requests_delta, 2) if requests_delta else 0.0,
+            "p50": total.get_current_response_time_percentile(0.5) or 0,
+            "p95": total.get_current_response_time_percentile(0.95) or 0,
+            "endpoints": self.sample_endpoints(interval),
+            "replicas": self.replica_source.poll(elapsed),
+        })
+
+    def sample_endpoints(self, interval):
+        """Per-endpoint RPS, error rate and current p95 since the previous sample"""
+        totals = {}
+        for (name, _method), entry in self.environment.stats.entries.items():
+            requests_total, failures_total, p95 = totals.get(name, (0, 0, 0))
+            totals[name] = (requests_total + entry.num_requests, failures_total + entry.num_failures,
+                            max(p95, entry.get_current_response_time_percentile(0.95) or 0))
+        endpoints = {}
+        for name, (requests_total, failures_total, p95) in totals.items():
+            last_requests, last_failures = self.last_endpoint_counts.get(name, (0, 0))
+            self.last_endpoint_counts[name] = (requests_total, failures_total)
+            requests_delta = requests_total - last_requests
+            if requests_delta:
+                endpoints[name] = {
+                    "rps": round(requests_delta / interval, 2),
+                    "error_pct": round(100.0 * (failures_total - last_failures) / requests_delta, 2),
+                    "p95": p95,
+                }
+        return endpoints
+
+
+def scaling_events(samples):
+    """Return replica count changes per HPA: [{hpa, t, phase, from, to}]"""
+    result, previous = [], {}
+    for sample in samples:
+        for name, counts in sample["replicas"].items():
+            current = counts["current"]
+            if name in previous and current != previous[name]:
+                result.append({"hpa": name, "t": sample["t"], "phase": sample["phase"],
+                               "from": previous[name], "to": current})
+            previous[name] = current
+    return result
+
+
+def analyze(samples, events_list, phase_starts):
+    """Time-to-scale and latency during scale-up, per HPA"""
+    ramp_start = phase_starts.get("ramp")
+    report = {}
+    for name in sorted({e["hpa"] for e in events_list} | {n for s in samples for n in s["replicas"]}):
+        counts = [s["replicas"][name]["current"] for s in samples if name in s["replicas"]]
+        ups = [e for e in events_list if e["hpa"] == name and e["to"] > e["from"]]
+        cpu = [s["replicas"][name]["cpu_pct"] for s in samples
+               if name in s["replicas"] and s["replicas"][name].get("cpu_pct") is not None]
+        entry = {
+            "min_replicas": min(counts) if counts else None,
+            "max_replicas": max(counts) if counts else None,
+            "max_cpu_pct": max(cpu) if cpu else None,
+            "scale_ups": len(ups),
+            "scale_downs": len([e for e in events_list if e["hpa"] == name and e["to"] < e["from"]]),
+        }
+        if ups and ramp_start is not None:
+            first_up = next((e for e in ups if e["t"] >= ramp_start), ups[0])
+            peak_at = next(s["t"] for s in samples
+                           if name in s["replicas"] and s["replicas"][name]["current"] == entry["max_replicas"])
+            during = [s for s in samples if ramp_start <= s["t"] <= peak_at and s["rps"]]
+            after = [s for s in samples if s["t"] > peak_at and s["phase"] == "steady" and s["rps"]]
+            entry.update({
+                "time_to_first_scale_up_s": round(first_up["t"] - ramp_start, 1),
+                "time_to_peak_replicas_s": round(peak_at - ramp_start, 1),
+                "during_scale_up": summarize(during),
+                "after_scale_up": summarize(after),
+            })
+        report[name] = entry
+    return report
+
+
+def summarize(samples):
+    if not samples:
+        return None
+    return {
+        "samples": len(samples),
+        "avg_rps": round(sum(s["rps"] for s in samples) / len(samples), 2),
+        "max_p95": max(s["p95"] for s in samples),
+        "avg_p95": round(sum(s["p95"] for s in samples) / len(samples), 1),
+        "avg_error_pct": round(sum(s["error_pct"] for s in samples) / len(samples), 2),
+    }
+
+
+def print_replicas(replicas):
+    if not replicas:
+        print("  HPA not found!")
+    for name, counts in sorted(replicas.items()):
+        cpu = f", CPU {counts['cpu_pct']}%" if counts.get("cpu_pct") is not None else ""
+        print(f"  {name}: {counts['current']} current / {counts['desired']} desired{cpu}")
+
+
+def run(args):
+    urls = {key: getattr(args, key) for key in DEFAULT_URLS}
+    if args.replica_source == "kubectl":
+        replica_source = KubectlReplicaSource(args.namespace)
+    else:
+        replica_source = FakeReplicaSource(args.fake_schedule)
+    phases = plan_phases(args)
+    warm_users = max(1, int(math.ceil(args.users * args.warm_fraction)))
+
+    print("🚀 Starting HPA Load Test for Todo App")
+    print("========================================")
+    print("📊 Test Configuration:")
+    print(f"  Users: {args.users} (warm-up/cool-down: {warm_users})")
+    print(f"  Spawn Rate: {args.spawn_rate}/sec")
+    print("  Phases: " + ", ".join(f"{phase} {seconds}s" for phase, seconds in phases))
+    print(f"  Replica source: {args.replica_source}")
+    for key, url in urls.items():
+        print(f"    - {key}: {url}")
+    print("")
+
+    print("🔍 Pre-test Health Checks:")
+    results = check_health(urls)
+    for name, (ok, detail) in results.items():
+        print(f"  {name}: {'✅ OK' if ok else '❌ FAILED'} ({detail})")
+    if not all(ok for ok, _ in results.values()) and not args.skip_health_check:
+        return 1
+    print("")
+
+    print("📈 Initial HPA Status:")
+    print_replicas(replica_source.poll(0))
+    print("")
+
+    options = parse_options([
+        "-f", locustfile.__file__, "--headless", "-u", str(args.users), "-r", str(args.spawn_rate),
+        "--host", urls["auth_url"],
+        "--auth-url", urls["auth_url"], "--todo-url", urls["todo_url"],
+        "--frontend-url", urls["frontend_url"], "--insights-url", urls["insights_url"],
+    ] + (["--seed", str(args.seed)] if args.seed is not None else []))
+    environment = Environment(
+        user_classes=[getattr(locustfile, args.user_class)], events=events,
+        parsed_options=options, host=urls["auth_url"],
+    )
+    runner = environment.create_local_runner()
+    environment.events.init.fire(environment=environment, runner=runner, web_ui=None)
+    timeline = Timeline(environment, replica_source)
+
+    print("🔥 Starting Load Test...")
+    try:
+        for phase, seconds in phases:
+            print(f"▶️  Phase: {phase} ({seconds}s)")
+            phase_start = time.time()
+            timeline.mark(phase)
+            current = None
+            while True:
+                progress = min((time.time() - phase_start) / seconds, 1.0) if seconds else 1.0
+                users = target_users(phase, progress, args.users, warm_users)
+                if users != current:
+                    runner.start(users, spawn_rate=args.spawn_rate)
+                    current = users
+                gevent.sleep(min(args.poll_interval, max(seconds - (time.time() - phase_start), 0)))
+                timeline.sample(phase, runner.user_count)
+                if time.time() - phase_start >= seconds:
+                    break
+    except KeyboardInterrupt:
+        print("⏹️  Stopped early")
+    finally:
+        runner.quit()
+
+    events_list = scaling_events(timeline.samples)
+    report = {
+        "config": {"users": args.users, "spawn_rate": args.spawn_rate, "phases": dict(phases),
+                   "user_class": args.user_class, "replica_source": args.replica_source, "urls": urls},
+        "scaling_events": events_list,
+        "phase_starts": timeline.phase_starts,
+        "analysis": analyze(timeline.samples, events_list, timeline.phase_starts),
+        "timeline": timeline.samples,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("")
+    print("📊 Post-test HPA Status:")
+    print_replicas(replica_source.poll(timeline.samples[-1]["t"] if timeline.samples else 0))
+    print("")
+    print("📈 Scaling Events:")
+    for event in events_list:
+        print(f"  t={event['t']}s [{event['phase']}] {event['hpa']}: {event['from']} → {event['to']}")
+    for name, entry in report["analysis"].items():
+        if "time_to_first_scale_up_s" in entry:
+            during = entry["during_scale_up"] or {}
+            print(f"  {name}: first scale-up {entry['time_to_first_scale_up_s']}s after ramp, "
+                  f"peak {entry['max_replicas']} replicas after {entry['time_to_peak_replicas_s']}s, "
+                  f"p95 during scale-up {during.get('avg_p95', '-')}ms (max {during.get('max_p95', '-')}ms)")
+    print("")
+    print("🎉 HPA Load Test Completed!")
+    print(f"📁 Timeline written to {args.output}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Phased HPA load test for the Todo App")
+    parser.add_argument("users", type=int, nargs="?", default=50, help="Peak number of users")
+    parser.add_argument("spawn_rate", type=float, nargs="?", default=10, help="Users spawned per second")
+    parser.add_argument("duration", type=int, nargs="?", default=300, help="Total test duration in seconds")
+    parser.add_argument("--warmup", type=int, help="Warm-up phase seconds (default 10%% of duration)")
+    parser.add_argument("--ramp", type=int, help="Ramp phase seconds (default 20%% of duration)")
+    parser.add_argument("--steady", type=int, help="Steady phase seconds (default 50%% of duration)")
+    parser.add_argument("--cooldown", type=int, help="Cool-down phase seconds (default 20%% of duration)")
+    parser.add_argument("--warm-fraction", type=float, default=0.1, help="Share of users during warm-up and cool-down")
+    parser.add_argument("--user-class", default="CPUIntensiveUser", help="User class from locustfile.py")
+    parser.add_argument("--seed", type=int, help="Run seed passed to the locustfile")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="Seconds between timeline samples")
+    parser.add_argument("--replica-source", choices=["kubectl", "fake"], default="kubectl")
+    parser.add_argument("--namespace", default="todo-app", help="Kubernetes namespace of the HPAs")
+    parser.add_argument("--fake-schedule", default="", help='Replica schedule for the fake source, e.g. "auth-hpa=0:1,60:2"')
+    parser.add_argument("--skip-health-check", action="store_true", help="Continue even if health checks fail")
+    parser.add_argument("--output", default="hpa-timeline.json", help="Timeline/report output file")
+    for key, url in DEFAULT_URLS.items():
+        parser.add_argument("--" + key.replace("_", "-"), default=url)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
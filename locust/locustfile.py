@@ -1,18 +1,29 @@
-import random
 import json
-import time
-from locust import HttpUser, task, between, events
+from locust import HttpUser, task, events
 from locust.exception import StopUser
+from locust.argument_parser import default_args_dict
+from locust.runners import MasterRunner, WorkerRunner
 
-class TodoAppUser(HttpUser):
+from artifacts import FailureLog
+from profiler import HarnessProfiler
+from recorder import RequestRecorder
+from seeding import next_user_index, resolve_seed, seeded_between, use_seeded_tasks, user_rng
+from soak import SoakMonitor
+from token_manager import REAUTH_REQUEST_NAME, ManagedTokenMixin, TokenManager
+
+class TodoAppUser(ManagedTokenMixin, HttpUser):
     """
     Simulates a real user interacting with the Todo application
     Tests the complete flow: Frontend -> Auth Service -> Todo Service
     """
-    wait_time = between(1, 3)
+    wait_time = seeded_between(1, 3)
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.user_index = next_user_index(self.environment)
+        self.rng = user_rng(self.environment.run_seed, self.user_index)
+        self.tokens = TokenManager(self.reauthenticate, self.environment.parsed_options.token_refresh_margin,
+                                   self.environment.token_stats, spawn=self.spawn_in_group)
         self.auth_token = None
         self.user_id = None
         self.todos = []
@@ -23,22 +34,27 @@ class TodoAppUser(HttpUser):
         self.frontend_url = self.environment.parsed_options.frontend_url or "http://34.22.249.41:30080"
         self.insights_url = self.environment.parsed_options.insights_url or "https://todo-app-insights-dev-tbv5uyb5va-ew.a.run.app"
         
+    def context(self):
+        """Tag request events with the user index (used by the request recorder)"""
+        return {"user_index": self.user_index}
+        
     def on_start(self):
         """Called when a user starts - simulates user registration/login"""
+        use_seeded_tasks(self)
         self.register_and_login()
         
     def on_stop(self):
         """Called when a user stops - cleanup"""
         if self.auth_token:
             self.logout()
+        super().on_stop()
     
     def register_and_login(self):
         """Register a new user and login to get auth token"""
-        # Generate unique user data with timestamp to avoid conflicts
-        timestamp = int(time.time() * 1000)  # Use milliseconds for uniqueness
-        user_id = random.randint(10000, 99999)
-        self.username = f"testuser{timestamp}{user_id}"  # Alphanumeric only
-        self.email = f"test{timestamp}{user_id}@example.com"
+        # Unique per run seed and user index; the same seed reuses the same accounts
+        seed = self.environment.run_seed
+        self.username = f"testuser{seed}u{self.user_index}"  # Alphanumeric only
+        self.email = f"test{seed}u{self.user_index}@example.com"
         self.password = "TestPassword123!"
         
         # First, check frontend health
@@ -119,6 +135,22 @@ class TodoAppUser(HttpUser):
             print(f"Failed to get auth token for user {self.email}")
             raise StopUser()
     
+    def reauthenticate(self):
+        """Log in again in the background; reported separately from the CRUD traffic"""
+        login_data = {"email": self.email, "password": self.password}
+        with self.client.post(f"{self.auth_url}/auth/login",
+                            json=login_data,
+                            catch_response=True,
+                            name=REAUTH_REQUEST_NAME) as response:
+            if response.status_code == 200:
+                try:
+                    return response.json().get('data', {}).get('token')
+                except ValueError as e:
+                    response.failure(f"Invalid JSON response: {e}")
+            else:
+                response.failure(f"Re-auth failed: {response.status_code}")
+        return None
+    
     def get_auth_headers(self):
         """Get authorization headers for API calls"""
         if not self.auth_token:
@@ -165,10 +197,10 @@ class TodoAppUser(HttpUser):
             return
             
         todo_data = {
-            "title": f"Test Todo {random.randint(1, 1000)}",
+            "title": f"Test Todo {self.rng.randint(1, 1000)}",
             "description": "This is a test todo created by Locust load testing",
-            "priority": random.choice(["low", "medium", "high"]),
-            "category": random.choice(["work", "personal", "shopping", "health", "general"]),
+            "priority": self.rng.choice(["low", "medium", "high"]),
+            "category": self.rng.choice(["work", "personal", "shopping", "health", "general"]),
             "dueDate": "2024-12-31"
         }
         
@@ -212,11 +244,11 @@ class TodoAppUser(HttpUser):
         if not self.auth_token or not self.todos:
             return
             
-        todo_id = random.choice(self.todos)
+        todo_id = self.rng.choice(self.todos)
         update_data = {
-            "title": f"Updated Todo {random.randint(1, 1000)}",
+            "title": f"Updated Todo {self.rng.randint(1, 1000)}",
             "description": "Updated by Locust test",
-            "priority": random.choice(["low", "medium", "high"])
+            "priority": self.rng.choice(["low", "medium", "high"])
         }
         
         with self.client.put(f"{self.todo_url}/todos/{todo_id}",
@@ -235,7 +267,7 @@ class TodoAppUser(HttpUser):
         if not self.auth_token or not self.todos:
             return
             
-        todo_id = random.choice(self.todos)
+        todo_id = self.rng.choice(self.todos)
         
         with self.client.patch(f"{self.todo_url}/todos/{todo_id}/complete",
                              headers=self.get_auth_headers(),
@@ -268,7 +300,7 @@ class TodoAppUser(HttpUser):
             return
             
         insights_data = {
-            "title": f"AI Test Task {random.randint(1, 1000)}",
+            "title": f"AI Test Task {self.rng.randint(1, 1000)}",
             "description": "Testing AI categorization and priority prediction",
             "userId": self.user_id
         }
@@ -292,7 +324,7 @@ class TodoAppUser(HttpUser):
         if not self.auth_token or not self.todos:
             return
             
-        todo_id = random.choice(self.todos)
+        todo_id = self.rng.choice(self.todos)
         
         with self.client.delete(f"{self.todo_url}/todos/{todo_id}",
                               headers=self.get_auth_headers(),
@@ -338,37 +370,45 @@ class TodoAppUser(HttpUser):
                 response.failure(f"Logout failed: {response.status_code}")
 
 
-class CPUIntensiveUser(HttpUser):
+class CPUIntensiveUser(ManagedTokenMixin, HttpUser):
     """
     Specialized user class for generating CPU load to test HPA scaling
     """
-    wait_time = between(0.1, 0.5)  # Much faster requests
+    wait_time = seeded_between(0.1, 0.5)  # Much faster requests
     weight = 2  # Higher weight for more instances
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.user_index = next_user_index(self.environment)
+        self.rng = user_rng(self.environment.run_seed, self.user_index)
+        self.tokens = TokenManager(self.reauthenticate, self.environment.parsed_options.token_refresh_margin,
+                                   self.environment.token_stats, spawn=self.spawn_in_group)
         self.auth_token = None
-        self.auth_url = "http://34.22.249.41:30081"
-        self.todo_url = "http://34.22.249.41:30082"
+        self.auth_url = self.environment.parsed_options.auth_url or "http://34.22.249.41:30081"
+        self.todo_url = self.environment.parsed_options.todo_url or "http://34.22.249.41:30082"
+        
+    def context(self):
+        return {"user_index": self.user_index}
         
     def on_start(self):
         """Quick login for load testing"""
+        use_seeded_tasks(self)
         self.quick_login()
         
     def quick_login(self):
         """Quick login with existing test user"""
         # Create a unique test user for load testing
-        timestamp = int(time.time() * 1000)
-        user_id = random.randint(1000, 9999)
+        seed = self.environment.run_seed
         
         login_data = {
-            "email": f"loadtest{timestamp}{user_id}@example.com",
+            "email": f"loadtest{seed}u{self.user_index}@example.com",
             "password": "TestPassword123!"
         }
+        self.login_data = login_data
         
         # Try to register first (in case user doesn't exist)
         register_data = {
-            "username": f"loadtester{timestamp}{user_id}",  # Alphanumeric only
+            "username": f"loadtester{seed}u{self.user_index}",  # Alphanumeric only
             "email": login_data["email"], 
             "password": login_data["password"],
             "firstName": "Load",
@@ -397,6 +437,19 @@ class CPUIntensiveUser(HttpUser):
             else:
                 response.failure(f"Login failed: {response.status_code}")
     
+    def reauthenticate(self):
+        """Background re-login before the token expires"""
+        with self.client.post(f"{self.auth_url}/auth/login", json=self.login_data,
+                              catch_response=True, name=REAUTH_REQUEST_NAME) as response:
+            if response.status_code == 200:
+                try:
+                    return response.json().get('data', {}).get('token')
+                except ValueError:
+                    response.failure("Invalid JSON response")
+            else:
+                response.failure(f"Re-auth failed: {response.status_code}")
+        return None
+    
     def get_auth_headers(self):
         if not self.auth_token:
             return {}
@@ -421,8 +474,8 @@ class CPUIntensiveUser(HttpUser):
             return
             
         todo_data = {
-            "title": f"Load Test {random.randint(1, 10000)}",
-            "description": f"Generated at {time.time()}",
+            "title": f"Load Test {self.rng.randint(1, 10000)}",
+            "description": f"Generated by load tester {self.user_index}",
             "priority": "medium",
             "category": "general"
         }
@@ -445,12 +498,94 @@ class CPUIntensiveUser(HttpUser):
             pass
 
 
+# Per-worker options that distributed.py only hands to the workers
+WORKER_LOCAL_OPTIONS = {"worker_index", "worker_count", "failure_log", "soak", "soak_summary", "record",
+                        "harness_profile", "contention_report"}
+
+
+def overridden_options(launched, current):
+    """Custom options a worker was started with that the master's spawn message replaced"""
+    defaults = default_args_dict()
+    return {key: (value, current.get(key)) for key, value in launched.items()
+            if key not in defaults and key not in WORKER_LOCAL_OPTIONS and current.get(key) != value}
+
+
 @events.init_command_line_parser.add_listener
 def _(parser):
     parser.add_argument("--auth-url", type=str, default="http://34.22.249.41:30081", help="Auth service URL")
     parser.add_argument("--todo-url", type=str, default="http://34.22.249.41:30082", help="Todo service URL") 
     parser.add_argument("--frontend-url", type=str, default="http://34.22.249.41:30080", help="Frontend URL")
     parser.add_argument("--insights-url", type=str, default="https://todo-app-insights-dev-tbv5uyb5va-ew.a.run.app", help="AI Insights URL")
+    parser.add_argument("--soak", action="store_true", default=False, help="Enable soak mode (windowed stats + drift detection)")
+    parser.add_argument("--soak-window", type=int, default=60, help="Soak mode window length in seconds")
+    parser.add_argument("--soak-p99-drift", type=float, default=20.0, help="Flag p99 growth above this many percent per hour")
+    parser.add_argument("--soak-error-drift", type=float, default=1.0, help="Flag error rate growth above this many percentage points per hour")
+    parser.add_argument("--soak-min-windows", type=int, default=30, help="Windows an endpoint needs before drift can be flagged")
+    parser.add_argument("--soak-summary", type=str, default="soak-summary.json", help="Soak mode summary output file")
+    parser.add_argument("--seed", type=int, default=None, help="Run seed; the same seed replays the same user traffic")
+    parser.add_argument("--record", type=str, default=None, help="Record the request stream to this file (.jsonl or .jsonl.gz)")
+    parser.add_argument("--token-refresh-margin", type=int, default=60, help="Re-authenticate this many seconds before the JWT expires")
+    parser.add_argument("--failure-log", type=str, default=None, help="Write failed requests to this JSON lines file")
+    parser.add_argument("--worker-index", type=int, default=0, help="Index of this worker in a distributed run")
+    parser.add_argument("--worker-count", type=int, default=1, help="Number of workers in a distributed run")
+    parser.add_argument("--harness-profile", type=str, default=None, help="Profile the load generator itself and write the results to this directory")
+    parser.add_argument("--profile-interval", type=float, default=10, help="Harness profiler sampling interval in milliseconds")
+    parser.add_argument("--saturation-cpu", type=float, default=90.0, help="Warn when the locust process uses more than this many percent of a core")
+    parser.add_argument("--saturation-lag", type=float, default=100.0, help="Warn when the gevent loop lag p95 exceeds this many milliseconds")
+
+@events.init.add_listener
+def _(environment, runner=None, **kwargs):
+    options = environment.parsed_options
+    environment.run_seed = resolve_seed(getattr(options, "seed", None))
+    environment.soak_monitor = None
+    environment.recorder = None
+    environment.failure_log = None
+    environment.harness_profiler = None
+    environment.token_stats = {}
+    # Workers get the master's custom options with every spawn message, so
+    # anything worker-specific has to be captured here, before the first spawn
+    environment.worker_shard = (getattr(options, "worker_index", 0) or 0, getattr(options, "worker_count", 1) or 1)
+    environment.soak_summary_path = getattr(options, "soak_summary", None)
+    environment.launch_options = dict(vars(options)) if options and isinstance(runner, WorkerRunner) else None
+    # In distributed runs requests only happen on workers, so the master keeps no artifacts
+    if isinstance(runner, MasterRunner):
+        return
+    if options and getattr(options, "soak", False):
+        environment.soak_monitor = SoakMonitor(
+            window_seconds=options.soak_window,
+            p99_drift_pct_per_hour=options.soak_p99_drift,
+            error_drift_pct_per_hour=options.soak_error_drift,
+            min_windows=options.soak_min_windows,
+        )
+
+        @environment.events.request.add_listener
+        def _(name, response_time, exception, **kwargs):
+            for message in environment.soak_monitor.record(name, response_time, exception is not None):
+                print(f"⚠️  Soak drift: {message}")
+
+    if options and getattr(options, "harness_profile", None):
+        environment.harness_profiler = HarnessProfiler(
+            options.harness_profile, environment.user_classes,
+            interval_ms=options.profile_interval,
+            cpu_threshold=options.saturation_cpu,
+            lag_threshold_ms=options.saturation_lag,
+        )
+
+    if options and getattr(options, "record", None):
+        targets = {key: getattr(options, key) for key in ("auth_url", "todo_url", "frontend_url", "insights_url")}
+        environment.recorder = RequestRecorder(options.record, environment.run_seed, targets)
+
+        @environment.events.request.add_listener
+        def _(request_type, name, response, context, start_time=None, **kwargs):
+            environment.recorder.record(request_type, name, response, context, start_time)
+
+    if options and getattr(options, "failure_log", None):
+        environment.failure_log = FailureLog(options.failure_log, options.worker_index)
+
+        @environment.events.request.add_listener
+        def _(request_type, name, exception, context, start_time=None, **kwargs):
+            if exception:
+                environment.failure_log.record(request_type, name, exception, context, start_time)
 
 @events.request.add_listener
 def _(request_type, name, response_time, response_length, response, context, exception, **kwargs):
@@ -466,8 +601,48 @@ def _(environment, **kwargs):
     print(f"  AI Insights: {environment.parsed_options.insights_url}")
     print(f"  Users: {environment.parsed_options.num_users}")
     print(f"  Spawn Rate: {environment.parsed_options.spawn_rate}")
+    print(f"  Seed: {environment.run_seed}")
+    launched = getattr(environment, "launch_options", None)
+    if launched:
+        for key, (value, used) in overridden_options(launched, vars(environment.parsed_options)).items():
+            print(f"⚠️  --{key.replace('_', '-')} {value} from the worker command line was replaced by the master's {used}; "
+                  f"pass it to the master as well")
+    if getattr(environment, "harness_profiler", None):
+        environment.harness_profiler.start()
 
 @events.test_stop.add_listener
 def _(environment, **kwargs):
+    token_stats = getattr(environment, "token_stats", None)
+    if token_stats:
+        print(f"Re-auth: {token_stats.get('refreshes', 0)} token refreshes, "
+              f"{token_stats.get('failures', 0)} failed, {token_stats.get('expired_waits', 0)} waits on expired tokens "
+              f"(see '{REAUTH_REQUEST_NAME}' in the stats)")
+    monitor = getattr(environment, "soak_monitor", None)
+    if monitor:
+        for message in monitor.close():
+            print(f"⚠️  Soak drift: {message}")
+        monitor.write_summary(environment.soak_summary_path)
+        print(f"Soak summary written to {environment.soak_summary_path}")
+        for drifting in monitor.summary()["drifting"]:
+            print(f"  Drifting: {drifting}")
+    if getattr(environment, "recorder", None):
+        environment.recorder.close()
+        print(f"Recorded {environment.recorder.count} requests to {environment.recorder.path}")
+    profiler = getattr(environment, "harness_profiler", None)
+    if profiler:
+        profiler.stop()
+        summary = profiler.write()
+        print(f"Harness: CPU avg {summary['cpu_pct']['avg']:.0f}% (max {summary['cpu_pct']['max']:.0f}%), "
+              f"loop lag p95 up to {summary['lag_ms']['p95_max']:.0f}ms, "
+              f"saturated in {summary['saturated_windows']}/{len(summary['windows'])} windows")
+        if summary["saturated_windows"]:
+            print("⚠️  The load generator was a bottleneck; latencies from saturated windows are inflated")
+        for task in summary["hot_tasks"]:
+            print(f"  Hot task: {task} {summary['tasks'][task]['seconds']:.2f}s Python time "
+                  f"({summary['tasks'][task]['share_pct']:.1f}% of samples)")
+        print(f"Harness profile written to {profiler.output_dir} (profile.folded for flamegraph.pl / speedscope)")
+    if getattr(environment, "failure_log", None):
+        environment.failure_log.close()
+        print(f"Logged {environment.failure_log.count} failed requests to {environment.failure_log.path}")
     print("Load test completed!")
     print("Check HPA status with: kubectl get hpa -n todo-app") 
\ No newline at end of file
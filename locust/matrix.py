@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Multi-target Matrix Benchmark for Todo App
+Runs the same user-class profile against several target sets (image tags,
+replica counts, a local stand-in vs the cluster) either one after another or
+interleaved in round-robin slices, and prints one comparison table with
+normalized throughput and tail latency.
+
+Interleaving spreads slow drift on the client or network (noisy neighbours,
+cache warm-up, time of day) evenly over all targets instead of penalising
+whichever target happens to run last.
+
+Usage:
+  python matrix.py TodoAppUser -u 20 -r 10 -t 120s --target cluster --target local=standin
+  python matrix.py CPUIntensiveUser -u 50 -t 300s --mode interleaved --slices 6 \\
+      --target v1=auth_url=http://10.0.0.1:30081,todo_url=http://10.0.0.1:30082,replicas=1 \\
+      --target v2=auth_url=http://10.0.0.2:30081,todo_url=http://10.0.0.2:30082,replicas=3
+  python matrix.py --matrix matrix.json --output matrix-results.json
+  python matrix.py -t 120s --target cluster --target local=standin -- --record {target}-recording.jsonl.gz
+"""
+
+import locust  # noqa: F401  (applies gevent monkey patching before anything else)
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import gevent
+from locust import events
+from locust.argument_parser import parse_options
+from locust.env import Environment
+from locust.event import EventHook, Events
+from locust.stats import RequestStats
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from distributed import LOCUSTFILE, TARGET_OPTIONS, start_standin  # noqa: E402
+from seeding import reset_user_index, resolve_seed  # noqa: E402
+
+PERCENTILES = [("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("p999", 0.999)]
+
+
+def parse_target(text):
+    """
+    Parse NAME[=SPEC] where SPEC is a comma separated list of a base URL (used
+    for all services) or "standin", plus key=value pairs for auth_url,
+    todo_url, frontend_url, insights_url, replicas and tag.
+    """
+    name, _, spec = text.partition("=")
+    target = {"name": name}
+    for part in filter(None, spec.split(",")):
+        key, sep, value = part.partition("=")
+        if not sep:
+            if part == "standin":
+                target["standin"] = True
+            else:
+                target["url"] = part
+        elif key in TARGET_OPTIONS + ["url", "tag"]:
+            target[key] = value
+        elif key == "replicas":
+            target[key] = int(value)
+        else:
+            raise argparse.ArgumentTypeError(f"unknown target key '{key}' in '{text}'")
+    return target
+
+
+def load_matrix(path):
+    """Read {"profile": {...}, "targets": [...]} from a JSON matrix file"""
+    with open(path) as f:
+        matrix = json.load(f)
+    return matrix.get("profile", {}), matrix.get("targets", [])
+
+
+def parse_seconds(value):
+    """'90', '90s', '10m' or '1h' -> seconds"""
+    value = str(value)
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def target_urls(target, standin_url=None):
+    """Resolve a target definition to --auth-url/--todo-url/... values (None keeps the locustfile default)"""
+    base = standin_url or target.get("url")
+    return {option: target.get(option) or base for option in TARGET_OPTIONS}
+
+
+def load_user_classes(locustfile, names):
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(locustfile))[0], locustfile)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    if not names:
+        names = [name for name, value in vars(module).items()
+                 if isinstance(value, type) and issubclass(value, locust.User)
+                 and not getattr(value, "abstract", False) and value.__module__ == module.__name__]
+    return [getattr(module, name) for name in names]
+
+
+def scoped_events():
+    """
+    A fresh Events instance carrying the listeners registered on the global
+    one so far (the locustfile's), so each target's runner only sees its own
+    requests and listeners added at init stay per target.
+    """
+    scoped = Events()
+    for name, hook in vars(events).items():
+        if isinstance(hook, EventHook):
+            for handler in hook._handlers:
+                getattr(scoped, name).add_listener(handler)
+    return scoped
+
+
+class TargetRun:
+    """
+    One target set: its locust environment plus the stats merged over every measured slice.
+
+    The locustfile's test_start/test_stop listeners are held back from the
+    runner, which would fire them around every slice, and fired once around
+    all slices instead, so artifacts opened at init stay open until quit().
+    """
+
+    def __init__(self, target, urls, profile, user_classes, locustfile, extra_args=()):
+        self.target = target
+        self.name = target["name"]
+        self.urls = urls
+        args = ["-f", locustfile, "--headless", "-u", str(profile["users"]), "-r", str(profile["spawn_rate"]),
+                "--seed", str(profile["seed"])]
+        for option, url in urls.items():
+            if url:
+                args += ["--" + option.replace("_", "-"), url]
+        options = parse_options(args + [arg.replace("{target}", self.name) for arg in extra_args])
+        self.environment = Environment(user_classes=user_classes, events=scoped_events(), parsed_options=options,
+                                       host=urls["auth_url"] or options.auth_url)
+        self.runner = self.environment.create_local_runner()
+        self.environment.events.init.fire(environment=self.environment, runner=self.runner, web_ui=None)
+        hooks = self.environment.events
+        self.test_start, self.test_stop = hooks.test_start, hooks.test_stop
+        hooks.test_start, hooks.test_stop = EventHook(), EventHook()
+        self.started = False
+        self.stats = RequestStats()
+        self.measured_seconds = 0.0
+        self.slices = 0
+
+    def run_slice(self, profile, warmup, seconds):
+        """Spawn the profile, drop the warm-up, measure for `seconds` and fold the result into self.stats"""
+        # Every slice of every target spawns users 0..N-1, so all see the same per-user RNG streams and accounts
+        reset_user_index(self.environment)
+        if not self.started:
+            self.started = True
+            self.test_start.fire(environment=self.environment)
+        self.runner.start(profile["users"], spawn_rate=profile["spawn_rate"])
+        gevent.sleep(warmup)
+        self.environment.stats.reset_all()
+        started = time.time()
+        gevent.sleep(seconds)
+        measured = time.time() - started
+        self.runner.stop()
+        for (name, method), entry in self.environment.stats.entries.items():
+            self.stats.get(name, method).extend(entry)
+        self.stats.total.extend(self.environment.stats.total)
+        self.measured_seconds += measured
+        self.slices += 1
+        self.environment.stats.reset_all()
+
+    def quit(self):
+        self.runner.quit()
+        if self.started:
+            self.started = False
+            self.test_stop.fire(environment=self.environment)
+
+
+def summarize_entry(entry, seconds):
+    summary = {
+        "requests": entry.num_requests,
+        "failures": entry.num_failures,
+        "error_pct": round(100.0 * entry.num_failures / entry.num_requests, 2) if entry.num_requests else 0.0,
+        "rps": round(entry.num_requests / seconds, 2) if seconds else 0.0,
+    }
+    for key, percentile in PERCENTILES:
+        summary[key] = entry.get_response_time_percentile(percentile) if entry.num_requests else None
+    return summary
+
+
+def compare(runs, reference):
+    """Per-target totals normalized against the reference target"""
+    results = []
+    for run in runs:
+        total = summarize_entry(run.stats.total, run.measured_seconds)
+        replicas = run.target.get("replicas")
+        total["rps_per_replica"] = round(total["rps"] / replicas, 2) if replicas else None
+        total["tail_ratio"] = round(total["p99"] / total["p50"], 2) if total["p50"] and total["p99"] else None
+        results.append({
+            "name": run.name,
+            "tag": run.target.get("tag"),
+            "replicas": replicas,
+            "urls": run.urls,
+            "measured_seconds": round(run.measured_seconds, 1),
+            "slices": run.slices,
+            "total": total,
+            "endpoints": {f"{method} {name}": summarize_entry(entry, run.measured_seconds)
+                          for (name, method), entry in sorted(run.stats.entries.items())},
+        })
+    base = next(result["total"] for result in results if result["name"] == reference)
+    for result in results:
+        total = result["total"]
+        total["rps_vs_ref"] = round(total["rps"] / base["rps"], 2) if base["rps"] else None
+        total["p99_vs_ref"] = round(total["p99"] / base["p99"], 2) if base["p99"] and total["p99"] else None
+    return results
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def _ratio(value):
+    return "-" if value is None else f"{value:.2f}x"
+
+
+def print_table(results, reference):
+    width = max([len(result["name"]) for result in results] + [6])
+    header = (f"{'Target':<{width}}  {'Reqs':>7}  {'RPS':>7}  {'RPS/rep':>7}  {'vs ref':>7}  "
+              f"{'p50':>6}  {'p95':>6}  {'p99':>6}  {'p99.9':>6}  {'p99/p50':>7}  {'p99 ref':>7}  {'Errors':>7}")
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        total = result["total"]
+        per_replica = "-" if total["rps_per_replica"] is None else f"{total['rps_per_replica']:.1f}"
+        marker = " *" if result["name"] == reference else ""
+        print(f"{result['name']:<{width}}  {total['requests']:>7}  {total['rps']:>7.1f}  {per_replica:>7}  "
+              f"{_ratio(total['rps_vs_ref']):>7}  {_ms(total['p50']):>6}  {_ms(total['p95']):>6}  "
+              f"{_ms(total['p99']):>6}  {_ms(total['p999']):>6}  {_ratio(total['tail_ratio']):>7}  "
+              f"{_ratio(total['p99_vs_ref']):>7}  {total['error_pct']:>6.2f}%{marker}")
+    print(f"\n* reference target; latencies in ms, RPS over measured time only")
+
+
+def print_endpoints(results):
+    names = sorted({name for result in results for name in result["endpoints"]})
+    width = max(len(name) for name in names)
+    print(f"\n{'Endpoint p99 (ms)':<{width}}  " + "  ".join(f"{result['name']:>10}" for result in results))
+    for name in names:
+        cells = [_ms(result["endpoints"].get(name, {}).get("p99")) for result in results]
+        print(f"{name:<{width}}  " + "  ".join(f"{cell:>10}" for cell in cells))
+
+
+def schedule(runs, mode, slices):
+    """Order of (run, slice index): A A B B for sequence, A B A B for interleaved"""
+    if mode == "sequence":
+        return [(run, index) for run in runs for index in range(slices)]
+    return [(run, index) for index in range(slices) for run in runs]
+
+
+def run(args, profile, targets, extra_args=()):
+    if len({target["name"] for target in targets}) != len(targets):
+        print("❌ Target names must be unique")
+        return 1
+    reference = args.baseline or targets[0]["name"]
+    if reference not in {target["name"] for target in targets}:
+        print(f"❌ Unknown reference target '{reference}'")
+        return 1
+
+    measure = parse_seconds(profile["run_time"]) / args.slices
+    warmup = args.warmup if args.warmup is not None else math.ceil(profile["users"] / profile["spawn_rate"])
+    user_classes = load_user_classes(args.locustfile, profile["user_classes"])
+
+    print("🚀 Starting matrix benchmark")
+    print(f"  User classes: {', '.join(cls.__name__ for cls in user_classes)}")
+    print(f"  Users: {profile['users']} (spawn rate {profile['spawn_rate']}/sec), seed {profile['seed']}")
+    print(f"  Mode: {args.mode}, {args.slices} slice(s) of {measure:.0f}s per target + {warmup}s warm-up each")
+
+    standins = []
+    runs = []
+    try:
+        for index, target in enumerate(targets):
+            standin_url = None
+            if target.get("standin"):
+                port = args.standin_port + index
+                standin_args = []
+                if isinstance(target["standin"], dict):
+                    for key, value in target["standin"].items():
+                        standin_args += ["--" + key.replace("_", "-"), str(value)]
+                process, standin_targets = start_standin(port, standin_args)
+                standins.append(process)
+                standin_url = standin_targets["auth_url"]
+            runs.append(TargetRun(target, target_urls(target, standin_url), profile, user_classes, args.locustfile,
+                                  extra_args))
+            labels = [f"{key}={target[key]}" for key in ("tag", "replicas") if target.get(key) is not None]
+            print(f"  Target {target['name']}: {runs[-1].urls['auth_url'] or 'locustfile defaults'}"
+                  + (f" ({', '.join(labels)})" if labels else ""))
+        print("")
+
+        for run_, index in schedule(runs, args.mode, args.slices):
+            print(f"▶️  {run_.name} slice {index + 1}/{args.slices}")
+            run_.run_slice(profile, warmup, measure)
+    except KeyboardInterrupt:
+        print("⏹️  Stopped early, reporting the slices measured so far")
+    finally:
+        for run_ in runs:
+            run_.quit()
+        for process in standins:
+            process.send_signal(signal.SIGINT)
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    runs = [run_ for run_ in runs if run_.slices]
+    if not any(run_.name == reference for run_ in runs):
+        print("❌ The reference target was never measured")
+        return 1
+    results = compare(runs, reference)
+    print("")
+    print("📊 Matrix results:")
+    print_table(results, reference)
+    if args.endpoints:
+        print_endpoints(results)
+
+    report = {
+        "profile": profile,
+        "mode": args.mode,
+        "slices": args.slices,
+        "warmup_seconds": warmup,
+        "reference": reference,
+        "targets": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📁 Results written to {args.output}")
+    return 0
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    extra_args = []
+    if "--" in argv:
+        extra_args = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+
+    parser = argparse.ArgumentParser(description="Run one locust profile against several target sets and compare them")
+    parser.add_argument("user_classes", nargs="*", help="User classes to run (default: all in the locustfile)")
+    parser.add_argument("-f", "--locustfile", default=LOCUSTFILE, help="Locustfile to run (e.g. contention.py)")
+    parser.add_argument("-u", "--users", type=int, help="Users per target (default 20)")
+    parser.add_argument("-r", "--spawn-rate", type=float, help="Users spawned per second (default 10)")
+    parser.add_argument("-t", "--run-time", help="Measured time per target, split over the slices (default 60s)")
+    parser.add_argument("--seed", type=int, help="Run seed shared by every target")
+    parser.add_argument("--matrix", help='JSON file with {"profile": {...}, "targets": [...]}')
+    parser.add_argument("--target", action="append", type=parse_target, default=[],
+                        help="NAME[=URL|standin][,auth_url=..,todo_url=..,frontend_url=..,insights_url=..,replicas=N,tag=T]")
+    parser.add_argument("--mode", choices=["sequence", "interleaved"], default="interleaved",
+                        help="Run targets one after another or round-robin in slices")
+    parser.add_argument("--slices", type=int, help="Slices per target (default 1 for sequence, 4 for interleaved)")
+    parser.add_argument("--warmup", type=float, help="Seconds dropped at the start of every slice (default users/spawn rate)")
+    parser.add_argument("--baseline", help="Reference target for the normalized columns (default: first target)")
+    parser.add_argument("--standin-port", type=int, default=8099, help="First port for stand-in targets")
+    parser.add_argument("--endpoints", action="store_true", help="Also print per-endpoint p99 per target")
+    parser.add_argument("--output", default="matrix-results.json", help="Comparison report output file")
+    args = parser.parse_args(argv)
+
+    profile, targets = load_matrix(args.matrix) if args.matrix else ({}, [])
+    targets = targets + args.target
+    if len(targets) < 2:
+        parser.error("give at least two targets with --target or --matrix")
+    overrides = {"user_classes": args.user_classes, "users": args.users, "spawn_rate": args.spawn_rate,
+                  "run_time": args.run_time, "seed": args.seed}
+    defaults = {"user_classes": [], "users": 20, "spawn_rate": 10, "run_time": "60s", "seed": None}
+    for key, default in defaults.items():
+        if overrides[key] not in (None, []):
+            profile[key] = overrides[key]
+        profile.setdefault(key, default)
+    # One seed for all targets so every target sees the same user traffic
+    profile["seed"] = resolve_seed(profile["seed"])
+    if args.slices is None:
+        args.slices = 1 if args.mode == "sequence" else 4
+    return run(args, profile, targets, extra_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
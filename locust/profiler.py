@@ -0,0 +1,218 @@
+"""
+Harness Self-Overhead Profiler
+Watches the load generator itself: process CPU, gevent loop lag and a
+sampling profile of the Python code running in the user greenlets.
+
+When the client is the bottleneck every latency it reports is inflated
+(requests sit in the gevent run queue before and after the network), so
+windows where the generator is saturated are flagged while the test runs.
+The sampled stacks are written as folded stacks, the input format of
+flamegraph.pl and speedscope, one file for the whole run plus one per hot task.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import gevent
+from gevent import monkey
+
+# Real OS primitives: the sampler has to keep running while a busy greenlet
+# holds the gevent loop, which a greenlet-based sampler never could
+_start_new_thread = monkey.get_original("_thread", "start_new_thread")
+_allocate_lock = monkey.get_original("_thread", "allocate_lock")
+_get_ident = monkey.get_original("_thread", "get_ident")
+_real_sleep = monkey.get_original("time", "sleep")
+
+IDLE = "(idle)"
+OTHER = "(locust)"
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def task_codes(user_classes):
+    """Map the code objects of every task and on_start/on_stop to a readable name"""
+    codes = {}
+    for user_class in user_classes:
+        for task in user_class.tasks:
+            code = getattr(task, "__code__", None)
+            if code is not None:
+                codes[code] = task.__name__
+        for hook in ("on_start", "on_stop"):
+            if hook in vars(user_class):
+                codes.setdefault(vars(user_class)[hook].__code__, f"{user_class.__name__}.{hook}")
+    return codes
+
+
+class HarnessProfiler:
+    """
+    Samples the main thread's Python stack from a real thread every
+    `interval_ms` and measures CPU and loop lag in `window_seconds` windows.
+
+    A window counts as saturated when process CPU reaches `cpu_threshold`
+    percent of one core (a locust process only ever uses one) or the p95
+    loop lag exceeds `lag_threshold_ms`.
+    """
+
+    def __init__(self, output_dir, user_classes, interval_ms=10, window_seconds=5,
+                 cpu_threshold=90.0, lag_threshold_ms=100.0, lag_probe_seconds=0.1, hot_tasks=3):
+        self.output_dir = output_dir
+        self.codes = task_codes(user_classes)
+        self.interval = interval_ms / 1000.0
+        self.window_seconds = window_seconds
+        self.cpu_threshold = cpu_threshold
+        self.lag_threshold_ms = lag_threshold_ms
+        self.lag_probe_seconds = lag_probe_seconds
+        self.hot_tasks = hot_tasks
+        self.stacks = Counter()
+        self.task_seconds = Counter()
+        self.windows = []
+        self.lags = []
+        self.saturated = False
+        self.running = False
+        self.started_at = None
+        self._done = None
+        self._monitor = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.started_at = self.started_at or time.time()
+        self._main_thread = _get_ident()
+        self._done = _allocate_lock()
+        self._done.acquire()
+        self._window_start = time.perf_counter()
+        self._window_cpu = sum(os.times()[:2])
+        _start_new_thread(self._sample_loop, ())
+        self._monitor = gevent.spawn(self._monitor_loop)
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self._monitor.kill()
+        self._roll_window()
+        self._done.acquire()
+
+    def _sample_loop(self):
+        try:
+            last = time.perf_counter()
+            while self.running:
+                _real_sleep(self.interval)
+                now = time.perf_counter()
+                frame = sys._current_frames().get(self._main_thread)
+                if frame is not None:
+                    self._record(frame, now - last)
+                del frame
+                last = now
+        finally:
+            self._done.release()
+
+    def _record(self, frame, seconds):
+        """Attribute one sample to the innermost task on the stack"""
+        names = []
+        task = None
+        innermost = frame.f_code
+        while frame is not None:
+            code = frame.f_code
+            if task is None and code in self.codes:
+                task = self.codes[code]
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+            frame = frame.f_back
+        if task is None:
+            task = IDLE if innermost.co_name == "run" and innermost.co_filename.endswith(os.path.join("gevent", "hub.py")) else OTHER
+        self.stacks[";".join([task] + names[::-1])] += 1
+        self.task_seconds[task] += seconds
+
+    def _monitor_loop(self):
+        while True:
+            probe = time.perf_counter()
+            gevent.sleep(self.lag_probe_seconds)
+            self.lags.append(max(0.0, (time.perf_counter() - probe - self.lag_probe_seconds) * 1000))
+            if time.perf_counter() - self._window_start >= self.window_seconds:
+                self._roll_window()
+
+    def _roll_window(self):
+        now = time.perf_counter()
+        cpu = sum(os.times()[:2])
+        elapsed = now - self._window_start
+        if elapsed <= 0:
+            return
+        window = {
+            "t": round(time.time() - self.started_at, 1),
+            "cpu_pct": round(100.0 * (cpu - self._window_cpu) / elapsed, 1),
+            "lag_p95_ms": round(_percentile(self.lags, 0.95), 1),
+            "lag_max_ms": round(max(self.lags, default=0.0), 1),
+        }
+        window["saturated"] = window["cpu_pct"] >= self.cpu_threshold or window["lag_p95_ms"] >= self.lag_threshold_ms
+        self.windows.append(window)
+        self.lags = []
+        self._window_start, self._window_cpu = now, cpu
+        if window["saturated"] != self.saturated:
+            self.saturated = window["saturated"]
+            if self.saturated:
+                print(f"⚠️  Load generator saturated: CPU {window['cpu_pct']:.0f}%, loop lag p95 "
+                      f"{window['lag_p95_ms']:.0f}ms - reported latencies are inflated, add workers")
+            else:
+                print(f"✅ Load generator recovered: CPU {window['cpu_pct']:.0f}%, loop lag p95 {window['lag_p95_ms']:.0f}ms")
+
+    def summary(self):
+        windows = self.windows
+        saturated = [window for window in windows if window["saturated"]]
+        total = sum(self.task_seconds.values())
+        busy = [task for task, _ in self.task_seconds.most_common() if task not in (IDLE, OTHER)]
+        return {
+            "thresholds": {"cpu_pct": self.cpu_threshold, "lag_p95_ms": self.lag_threshold_ms},
+            "cpu_pct": {
+                "avg": round(sum(window["cpu_pct"] for window in windows) / len(windows), 1) if windows else 0.0,
+                "max": max((window["cpu_pct"] for window in windows), default=0.0),
+            },
+            "lag_ms": {
+                "p95_max": max((window["lag_p95_ms"] for window in windows), default=0.0),
+                "max": max((window["lag_max_ms"] for window in windows), default=0.0),
+            },
+            "saturated_windows": len(saturated),
+            "saturated_pct": round(100.0 * len(saturated) / len(windows), 1) if windows else 0.0,
+            "tasks": {
+                task: {"seconds": round(seconds, 3), "share_pct": round(100.0 * seconds / total, 1) if total else 0.0}
+                for task, seconds in self.task_seconds.most_common()
+            },
+            "hot_tasks": busy[:self.hot_tasks],
+            "windows": windows,
+        }
+
+    def write(self):
+        """Write harness-summary.json, profile.folded and profile-<task>.folded per hot task"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary = self.summary()
+        with open(os.path.join(self.output_dir, "harness-summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        write_folded(self.stacks, os.path.join(self.output_dir, "profile.folded"))
+        for task in summary["hot_tasks"]:
+            write_folded({stack: count for stack, count in self.stacks.items() if stack.split(";", 1)[0] == task},
+                         os.path.join(self.output_dir, f"profile-{task}.folded"))
+        return summary
+
+
+def write_folded(stacks, path):
+    with open(path, "w") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+def read_folded(path):
+    stacks = Counter()
+    with open(path) as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
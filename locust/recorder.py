@@ -0,0 +1,96 @@
+"""
+Request Stream Recorder
+Saves the exact request stream of a locust run to a compact gzipped JSON
+lines file that replay.py can re-issue against another build.
+
+File layout:
+  line 1   - header: {"seed", "started_at", "targets"}
+  line 2.. - one request: {"t", "u", "m", "url", "n", "b", "a", "s", "id", "token"}
+             t = seconds since start, u = user index, m = HTTP method,
+             n = request name, b = JSON body, a = sent an auth header,
+             s = status code, id / token = values captured from the response
+"""
+
+import gzip
+import json
+import time
+
+
+def open_recording(path, mode="rt"):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode.replace("t", ""))
+
+
+def _decode_body(body):
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+def _captures(response):
+    """Extract the created todo id and issued token from a JSON response"""
+    try:
+        data = response.json().get("data") or {}
+    except (ValueError, AttributeError):
+        return None, None
+    if not isinstance(data, dict):
+        return None, None
+    todo = data.get("todo") or {}
+    return (todo.get("id") if isinstance(todo, dict) else None), data.get("token")
+
+
+class RequestRecorder:
+    """Writes one line per request event to a recording file"""
+
+    def __init__(self, path, seed, targets, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.started_at = clock()
+        self.count = 0
+        self.file = open_recording(path, "wt")
+        header = {"seed": seed, "started_at": self.started_at, "targets": targets}
+        self.file.write(json.dumps(header, separators=(",", ":")) + "\n")
+
+    def record(self, request_type, name, response, context, start_time=None):
+        request = getattr(response, "request", None)
+        if request is None:
+            return
+        started = start_time if start_time is not None else self.clock()
+        entry = {
+            "t": round(started - self.started_at, 4),
+            "u": (context or {}).get("user_index"),
+            "m": request.method,
+            "url": request.url,
+            "n": name,
+        }
+        body = _decode_body(request.body)
+        if body is not None:
+            entry["b"] = body
+        if "Authorization" in request.headers:
+            entry["a"] = 1
+        entry["s"] = response.status_code
+        if request.method == "POST" and response.status_code in (200, 201):
+            todo_id, token = _captures(response)
+            if todo_id is not None:
+                entry["id"] = todo_id
+            if token:
+                entry["token"] = 1
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+
+def read_recording(path):
+    """Return (header, entries) for a recording file"""
+    with open_recording(path) as f:
+        header = json.loads(f.readline())
+        entries = [json.loads(line) for line in f if line.strip()]
+    return header, entries
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Request Stream Replayer
+Re-issues a recording made with `locust ... --record` against another build,
+keeping each user's request order and the original timing.
+
+Usage:
+  python replay.py run.jsonl.gz --auth-url http://localhost:3001 --todo-url http://localhost:3002
+"""
+
+from gevent import monkey
+
+monkey.patch_all()
+
+import argparse
+import json
+import time
+
+import gevent
+import requests
+
+from recorder import read_recording
+from soak import LatencyHistogram
+
+TARGET_OPTIONS = ["auth_url", "todo_url", "frontend_url", "insights_url"]
+
+
+class UserReplay:
+    """Replays one recorded user's requests, re-mapping tokens and todo ids"""
+
+    def __init__(self, user_index, entries, rewrite, results):
+        self.user_index = user_index
+        self.entries = entries
+        self.rewrite = rewrite
+        self.results = results
+        self.session = requests.Session()
+        self.token = None
+        self.id_map = {}
+        self.credentials = None
+
+    def url(self, entry):
+        url = self.rewrite(entry["url"])
+        if not self.id_map:
+            return url
+        parts = url.split("/")
+        for i, part in enumerate(parts):
+            if part in self.id_map:
+                parts[i] = self.id_map[part]
+        return "/".join(parts)
+
+    def send(self, entry):
+        headers = {"Authorization": f"Bearer {self.token}"} if entry.get("a") and self.token else {}
+        body = entry.get("b")
+        if entry["n"] == "Verify Token" and isinstance(body, dict) and self.token:
+            body = dict(body, token=self.token)
+        started = time.time()
+        try:
+            response = self.session.request(
+                entry["m"], self.url(entry), headers=headers,
+                json=body if not isinstance(body, str) else None,
+                data=body if isinstance(body, str) else None,
+                timeout=60,
+            )
+        except requests.RequestException as e:
+            self.results.add(entry, (time.time() - started) * 1000, None, str(e))
+            return None
+        self.results.add(entry, (time.time() - started) * 1000, response.status_code, None)
+        return response
+
+    def capture(self, entry, response):
+        if response is None or response.status_code not in (200, 201):
+            return
+        try:
+            data = response.json().get("data") or {}
+        except (ValueError, AttributeError):
+            return
+        if entry.get("token") and data.get("token"):
+            self.token = data["token"]
+        if "id" in entry and isinstance(data.get("todo"), dict):
+            self.id_map[str(entry["id"])] = str(data["todo"]["id"])
+
+    def run(self, start, speed):
+        for entry in self.entries:
+            delay = start + entry["t"] / speed - time.time()
+            if delay > 0:
+                gevent.sleep(delay)
+            else:
+                self.results.lag.add(-delay * 1000)
+            if isinstance(entry.get("b"), dict) and "password" in entry["b"]:
+                self.credentials = {"email": entry["b"]["email"], "password": entry["b"]["password"]}
+            response = self.send(entry)
+            self.capture(entry, response)
+            # The user may already exist on the target build; log in so later requests still authenticate
+            if (entry["n"] == "User Registration" and response is not None
+                    and response.status_code == 409 and entry.get("token") and self.credentials):
+                login = dict(entry, n="User Login (replay)", m="POST", b=self.credentials, s=200,
+                             url=entry["url"].replace("/auth/register", "/auth/login"))
+                self.capture(login, self.send(login))
+
+
+class ReplayResults:
+    """Per-name latency histograms and status mismatches against the recording"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.failures = {}
+        self.mismatches = {}
+        self.lag = LatencyHistogram()
+
+    def add(self, entry, response_time, status, error):
+        name = entry["n"]
+        self.histograms.setdefault(name, LatencyHistogram()).add(response_time)
+        if error or status is None or status >= 400:
+            self.failures[name] = self.failures.get(name, 0) + 1
+        if status != entry.get("s"):
+            self.mismatches[name] = self.mismatches.get(name, 0) + 1
+
+    def summary(self):
+        endpoints = {}
+        for name, histogram in sorted(self.histograms.items()):
+            endpoints[name] = {
+                "requests": histogram.count,
+                "failures": self.failures.get(name, 0),
+                "status_mismatches": self.mismatches.get(name, 0),
+                "p50": round(histogram.quantile(0.5), 1),
+                "p99": round(histogram.quantile(0.99), 1),
+            }
+        return {
+            "endpoints": endpoints,
+            "late_requests": self.lag.count,
+            "max_lag_ms": round(self.lag.max, 1),
+        }
+
+
+def build_rewrite(recorded_targets, new_targets):
+    """Return a function that maps recorded URLs onto the new target URLs"""
+    prefixes = []
+    for option in TARGET_OPTIONS:
+        old, new = recorded_targets.get(option), new_targets.get(option)
+        if old and new and old != new:
+            prefixes.append((old.rstrip("/"), new.rstrip("/")))
+    # Longest prefix first so e.g. ".../insights" wins over its host
+    prefixes.sort(key=lambda pair: len(pair[0]), reverse=True)
+
+    def rewrite(url):
+        for old, new in prefixes:
+            if url == old or url.startswith(old + "/") or url.startswith(old + "?"):
+                return new + url[len(old):]
+        return url
+
+    return rewrite
+
+
+def replay(path, targets, speed=1.0):
+    header, entries = read_recording(path)
+    rewrite = build_rewrite(header.get("targets", {}), targets)
+    users = {}
+    for entry in entries:
+        users.setdefault(entry.get("u"), []).append(entry)
+    results = ReplayResults()
+    start = time.time()
+    greenlets = [
+        gevent.spawn(UserReplay(index, user_entries, rewrite, results).run, start, speed)
+        for index, user_entries in users.items()
+    ]
+    gevent.joinall(greenlets)
+    summary = results.summary()
+    summary.update({
+        "recording": path,
+        "seed": header.get("seed"),
+        "users": len(users),
+        "requests": len(entries),
+        "duration_seconds": round(time.time() - start, 1),
+        "targets": {option: url for option, url in targets.items() if url},
+    })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded locust request stream")
+    parser.add_argument("recording", help="Recording file written by --record")
+    parser.add_argument("--auth-url", help="Auth service URL of the build under test")
+    parser.add_argument("--todo-url", help="Todo service URL of the build under test")
+    parser.add_argument("--frontend-url", help="Frontend URL of the build under test")
+    parser.add_argument("--insights-url", help="AI Insights URL of the build under test")
+    parser.add_argument("--speed", type=float, default=1.0, help="Timing multiplier (2.0 = twice as fast)")
+    parser.add_argument("--output", default="replay-summary.json", help="Replay summary output file")
+    args = parser.parse_args()
+
+    targets = {option: getattr(args, option) for option in TARGET_OPTIONS}
+    print(f"🔁 Replaying {args.recording} (speed x{args.speed})...")
+    summary = replay(args.recording, targets, args.speed)
+
+    with open(args.output, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"✅ Replayed {summary['requests']} requests from {summary['users']} users "
+          f"in {summary['duration_seconds']}s")
+    for name, stats in summary["endpoints"].items():
+        print(f"  {name}: {stats['requests']} req, {stats['failures']} failed, "
+              f"p50 {stats['p50']}ms, p99 {stats['p99']}ms, {stats['status_mismatches']} status changes")
+    print(f"📁 Summary written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
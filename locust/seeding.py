@@ -0,0 +1,57 @@
+"""
+Deterministic Seeding for Locust Users
+Gives every simulated user its own seeded RNG so that a run with the same
+--seed sends the same usernames, payloads, task order and think times.
+"""
+
+import itertools
+import random
+
+_user_counter = itertools.count()
+
+
+def resolve_seed(seed=None):
+    """Return the run seed, picking a fresh one if none was given"""
+    if seed is None:
+        seed = random.SystemRandom().randint(1, 10 ** 9)
+    return seed
+
+
+def next_user_index(environment=None):
+    """
+    Return the next user index for this environment.
+
+    The counter lives on the environment, so several environments in one
+    process (matrix.py) each hand out 0, 1, 2, ... In a distributed run
+    worker i of n hands out i, i + n, i + 2n, ... so the user pool (and
+    every user's RNG seed) is sharded without overlap.
+    """
+    worker_index, worker_count = getattr(environment, "worker_shard", (0, 1))
+    if environment is None:
+        counter = _user_counter
+    else:
+        counter = getattr(environment, "user_counter", None)
+        if counter is None:
+            counter = environment.user_counter = itertools.count()
+    return worker_index + worker_count * next(counter)
+
+
+def reset_user_index(environment):
+    """Start handing out user indices from the beginning again"""
+    environment.user_counter = itertools.count()
+
+
+def user_rng(seed, user_index):
+    """Return the RNG for one user; independent of spawn timing and hash seeds"""
+    return random.Random(f"{seed}-{user_index}")
+
+
+def seeded_between(min_wait, max_wait):
+    """Seeded replacement for locust's between() using the user's own RNG"""
+    return lambda user: min_wait + user.rng.random() * (max_wait - min_wait)
+
+
+def use_seeded_tasks(user):
+    """Make the user's task picker draw from user.rng instead of the global RNG"""
+    taskset = user._taskset_instance
+    taskset.get_next_task = lambda: user.rng.choice(user.tasks)
@@ -0,0 +1,338 @@
+"""
+Soak Mode - Long-Duration Load Test Statistics
+Keeps bounded-memory, time-windowed stats per endpoint and detects latency
+and error-rate drift with online linear regression.
+
+Memory use does not grow with run length: every window only keeps a sparse
+log-bucket histogram per endpoint, finished windows are reduced to a handful
+of numbers, and the trend fits are updated incrementally.
+"""
+
+import json
+import math
+import time
+from collections import deque
+
+# Histogram resolution: each bucket is 2% wider than the previous one
+BUCKET_GROWTH = 1.02
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+
+class LatencyHistogram:
+    """Sparse log-bucket latency histogram with ~1% quantile error"""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value_ms, count=1):
+        bucket = 0 if value_ms < 1 else int(math.log(value_ms) / _LOG_GROWTH) + 1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += count
+        self.total += value_ms * count
+        self.max = max(self.max, value_ms)
+
+    def merge(self, other):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """Return the approximate latency (ms) at quantile q (0..1)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                if bucket == 0:
+                    return min(1.0, self.max)
+                # Geometric midpoint of the bucket, capped by the observed max
+                return min(BUCKET_GROWTH ** (bucket - 0.5), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self):
+        return {
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.buckets = {int(k): v for k, v in data.get("buckets", {}).items()}
+        histogram.count = data.get("count", 0)
+        histogram.total = data.get("total", 0.0)
+        histogram.max = data.get("max", 0.0)
+        return histogram
+
+
+class OnlineRegression:
+    """Incremental least-squares fit of y = intercept + slope * x"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sxx = 0.0
+        self.sxy = 0.0
+        self.syy = 0.0
+
+    def add(self, x, y):
+        self.n += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.n
+        self.mean_y += dy / self.n
+        self.sxx += dx * (x - self.mean_x)
+        self.sxy += dx * (y - self.mean_y)
+        self.syy += dy * (y - self.mean_y)
+
+    def slope(self):
+        return self.sxy / self.sxx if self.sxx > 0 else 0.0
+
+    def intercept(self):
+        return self.mean_y - self.slope() * self.mean_x
+
+    def predict(self, x):
+        return self.intercept() + self.slope() * x
+
+    def slope_p_value(self):
+        """One-sided p-value for the hypothesis that the slope is > 0"""
+        if self.n < 3 or self.sxx <= 0:
+            return 1.0
+        sse = max(self.syy - self.slope() * self.sxy, 0.0)
+        df = self.n - 2
+        stderr = math.sqrt(sse / df / self.sxx)
+        if stderr == 0:
+            return 0.0 if self.slope() > 0 else 1.0
+        return student_t_sf(self.slope() / stderr, df)
+
+
+def student_t_sf(t, df):
+    """Survival function P(T > t) of Student's t distribution"""
+    x = df / (df + t * t)
+    tail = 0.5 * _regularized_beta(x, df / 2.0, 0.5)
+    return tail if t > 0 else 1.0 - tail
+
+
+def _regularized_beta(x, a, b):
+    """Regularized incomplete beta function I_x(a, b)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+        + a * math.log(x) + b * math.log(1 - x)
+    )
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_continued_fraction(x, a, b) / a
+    return 1.0 - front * _beta_continued_fraction(1 - x, b, a) / b
+
+
+def _beta_continued_fraction(x, a, b, max_iterations=200, epsilon=1e-12):
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, max_iterations + 1):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= d * c
+        if abs(d * c - 1.0) < epsilon:
+            break
+    return result
+
+
+class EndpointWindow:
+    """Request counters and latency histogram for one endpoint in one window"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.failures = 0
+
+    def add(self, response_time, failed):
+        self.histogram.add(response_time)
+        if failed:
+            self.failures += 1
+
+
+class EndpointTrend:
+    """Per-endpoint trend fits over window summaries"""
+
+    def __init__(self):
+        self.p99 = OnlineRegression()
+        self.error_rate = OnlineRegression()
+        self.total = LatencyHistogram()
+        self.failures = 0
+
+
+class SoakMonitor:
+    """
+    Aggregates request events into fixed time windows and flags drift.
+
+    p99 drift is expressed relative to the fitted p99 of the first window
+    (e.g. 20 means "p99 grows by 20% of its starting value every hour");
+    error-rate drift is expressed in percentage points per hour.
+    """
+
+    def __init__(self, window_seconds=60, p99_drift_pct_per_hour=20.0,
+                 error_drift_pct_per_hour=1.0, alpha=0.01, min_windows=30,
+                 max_windows=1440, clock=time.time):
+        self.window_seconds = window_seconds
+        self.p99_drift_pct_per_hour = p99_drift_pct_per_hour
+        self.error_drift_pct_per_hour = error_drift_pct_per_hour
+        self.alpha = alpha
+        self.min_windows = min_windows
+        self.clock = clock
+        self.started_at = None
+        self.window_start = None
+        self.current = {}
+        self.trends = {}
+        self.windows = deque(maxlen=max_windows)
+        # windows only keeps the most recent max_windows summaries
+        self.rolled_windows = 0
+        self.flagged = set()
+
+    def record(self, name, response_time, failed, timestamp=None):
+        now = self.clock() if timestamp is None else timestamp
+        if self.started_at is None:
+            self.started_at = now
+            self.window_start = now
+        messages = []
+        while now - self.window_start >= self.window_seconds:
+            messages.extend(self.roll_window())
+        window = self.current.get(name)
+        if window is None:
+            window = self.current[name] = EndpointWindow()
+        window.add(response_time, failed)
+        return messages
+
+    def roll_window(self):
+        """Close the current window and feed its summary into the trend fits"""
+        if self.window_start is None:
+            return []
+        hours = (self.window_start + self.window_seconds / 2.0 - self.started_at) / 3600.0
+        summary = {"start": round(self.window_start - self.started_at, 3), "endpoints": {}}
+        for name, window in self.current.items():
+            count = window.histogram.count
+            p99 = window.histogram.quantile(0.99)
+            error_pct = 100.0 * window.failures / count if count else 0.0
+            trend = self.trends.get(name)
+            if trend is None:
+                trend = self.trends[name] = EndpointTrend()
+            trend.p99.add(hours, p99)
+            trend.error_rate.add(hours, error_pct)
+            trend.total.merge(window.histogram)
+            trend.failures += window.failures
+            summary["endpoints"][name] = {
+                "requests": count,
+                "rps": round(count / float(self.window_seconds), 3),
+                "p50": round(window.histogram.quantile(0.5), 1),
+                "p99": round(p99, 1),
+                "error_pct": round(error_pct, 3),
+            }
+        self.windows.append(summary)
+        self.rolled_windows += 1
+        self.current = {}
+        self.window_start += self.window_seconds
+        return self.check_drift()
+
+    def drift(self, name):
+        """Return the drift assessment for one endpoint"""
+        trend = self.trends[name]
+        baseline = trend.p99.predict(0.0)
+        if baseline <= 0:
+            baseline = trend.p99.mean_y
+        p99_rate = 100.0 * trend.p99.slope() / baseline if baseline > 0 else 0.0
+        enough = trend.p99.n >= self.min_windows
+        p99_p = trend.p99.slope_p_value()
+        error_p = trend.error_rate.slope_p_value()
+        return {
+            "windows": trend.p99.n,
+            "p99_pct_per_hour": round(p99_rate, 2),
+            "p99_p_value": round(p99_p, 5),
+            "p99_drift": enough and p99_rate >= self.p99_drift_pct_per_hour and p99_p < self.alpha,
+            "error_pct_per_hour": round(trend.error_rate.slope(), 3),
+            "error_p_value": round(error_p, 5),
+            "error_drift": enough
+            and trend.error_rate.slope() >= self.error_drift_pct_per_hour
+            and error_p < self.alpha,
+        }
+
+    def check_drift(self):
+        """Return messages for endpoints that started drifting since the last check"""
+        messages = []
+        for name in sorted(self.trends):
+            assessment = self.drift(name)
+            for kind, key, rate_key, p_key, unit in (
+                ("p99", "p99_drift", "p99_pct_per_hour", "p99_p_value", "%/h"),
+                ("error rate", "error_drift", "error_pct_per_hour", "error_p_value", " pp/h"),
+            ):
+                if not assessment[key]:
+                    self.flagged.discard((name, kind))
+                elif (name, kind) not in self.flagged:
+                    self.flagged.add((name, kind))
+                    messages.append(
+                        f"{name}: {kind} drifting {assessment[rate_key]:+}{unit} "
+                        f"(p={assessment[p_key]})"
+                    )
+        return messages
+
+    def close(self):
+        """Flush the partially filled window at the end of the run"""
+        if self.current:
+            return self.roll_window()
+        return []
+
+    def summary(self):
+        endpoints = {}
+        for name, trend in sorted(self.trends.items()):
+            count = trend.total.count
+            endpoints[name] = {
+                "requests": count,
+                "failures": trend.failures,
+                "error_pct": round(100.0 * trend.failures / count, 3) if count else 0.0,
+                "mean": round(trend.total.mean(), 1),
+                "p50": round(trend.total.quantile(0.5), 1),
+                "p95": round(trend.total.quantile(0.95), 1),
+                "p99": round(trend.total.quantile(0.99), 1),
+                "max": round(trend.total.max, 1),
+                "drift": self.drift(name),
+                "histogram": trend.total.to_dict(),
+            }
+        return {
+            "window_seconds": self.window_seconds,
+            "duration_seconds": round(self.rolled_windows * self.window_seconds, 1),
+            "thresholds": {
+                "p99_pct_per_hour": self.p99_drift_pct_per_hour,
+                "error_pct_per_hour": self.error_drift_pct_per_hour,
+                "alpha": self.alpha,
+                "min_windows": self.min_windows,
+            },
+            "drifting": sorted(f"{name} ({kind})" for name, kind in self.flagged),
+            "endpoints": endpoints,
+            "windows": list(self.windows),
+        }
+
+    def write_summary(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, separators=(",", ":"))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Local Stand-in Target for the Todo App
+A small in-memory HTTP server that answers the same routes the locustfile
+calls (auth, todo CRUD, frontend, AI insights) so load-test tooling can be
+validated offline. All services share one port.
+
+Usage:
+  python standin.py --port 8099
+  locust -f locustfile.py --auth-url http://127.0.0.1:8099 --todo-url http://127.0.0.1:8099 \\
+      --frontend-url http://127.0.0.1:8099 --insights-url http://127.0.0.1:8099
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SECRET = b"standin-secret"
+TODO_PATH = re.compile(r"^/todos/(\d+)(/complete|/incomplete)?$")
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def issue_token(user_id, ttl):
+    """Return an HS256 JWT for user_id that expires after ttl seconds"""
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    now = int(time.time())
+    payload = _b64(json.dumps({"userId": user_id, "iat": now, "exp": now + ttl}).encode())
+    signature = _b64(hmac.new(SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest())
+    return f"{header}.{payload}.{signature}"
+
+
+def check_token(token):
+    """Return the user id for a valid, unexpired token, otherwise None"""
+    try:
+        header, payload, signature = token.split(".")
+        expected = _b64(hmac.new(SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest())
+        if not hmac.compare_digest(signature, expected):
+            return None
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (ValueError, AttributeError):
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims.get("userId")
+
+
+class Store:
+    """In-memory users and todos guarded by a single lock"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}
+        self.todos = {}
+        self.next_user_id = 1
+        self.next_todo_id = 1
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    store = None
+    token_ttl = 86400
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def current_user(self):
+        auth = self.headers.get("Authorization", "")
+        return check_token(auth[7:]) if auth.startswith("Bearer ") else None
+
+    def handle_request(self, method):
+        if self.latency:
+            time.sleep(self.latency)
+        path = self.path.split("?", 1)[0]
+        body = self.read_json() if method in ("POST", "PUT", "PATCH") else {}
+
+        if method == "GET" and path == "/health":
+            return self.send_json(200, {"status": "healthy", "service": "standin"})
+        if method == "GET" and path == "/":
+            return self.send_json(200, {"app": "todo-frontend-standin"})
+        if method == "POST" and path == "/":
+            return self.send_json(200, {"success": True, "data": {"category": "general", "priority": "medium"}})
+        if path.startswith("/auth/"):
+            return self.handle_auth(method, path, body)
+        if path == "/todos" or path.startswith("/todos/"):
+            user_id = self.current_user()
+            if user_id is None:
+                return self.send_json(401, {"success": False, "message": "Invalid or expired token"})
+            return self.handle_todos(method, path, body, user_id)
+        return self.send_json(404, {"success": False, "message": "Route not found"})
+
+    def handle_auth(self, method, path, body):
+        store = self.store
+        if method == "POST" and path == "/auth/register":
+            if not all(body.get(key) for key in ("username", "email", "password")):
+                return self.send_json(400, {"success": False, "message": "Validation error"})
+            with store.lock:
+                if body["email"] in store.users or any(
+                        user["username"] == body["username"] for user in store.users.values()):
+                    return self.send_json(409, {"success": False, "message": "User already exists"})
+                user = {"id": store.next_user_id, "username": body["username"],
+                        "email": body["email"], "password": body["password"]}
+                store.next_user_id += 1
+                store.users[body["email"]] = user
+            return self.send_json(201, {"success": True, "data": {
+                "token": issue_token(user["id"], self.token_ttl),
+                "user": {"id": user["id"], "username": user["username"]}}})
+        if method == "POST" and path == "/auth/login":
+            user = store.users.get(body.get("email"))
+            if not user or user["password"] != body.get("password"):
+                return self.send_json(401, {"success": False, "message": "Invalid credentials"})
+            return self.send_json(200, {"success": True, "data": {
+                "token": issue_token(user["id"], self.token_ttl),
+                "user": {"id": user["id"], "username": user["username"]}}})
+        if method == "POST" and path == "/auth/verify":
+            user_id = check_token(body.get("token", ""))
+            if user_id is None:
+                return self.send_json(401, {"success": False, "message": "Invalid token"})
+            return self.send_json(200, {"success": True, "data": {"userId": user_id}})
+        if method == "POST" and path == "/auth/logout":
+            return self.send_json(200, {"success": True})
+        return self.send_json(404, {"success": False, "message": "Route not found"})
+
+    def handle_todos(self, method, path, body, user_id):
+        store = self.store
+        if path == "/todos/stats/summary" and method == "GET":
+            with store.lock:
+                own = [todo for todo in store.todos.values() if todo["userId"] == user_id]
+            completed = sum(1 for todo in own if todo["completed"])
+            return self.send_json(200, {"success": True, "data": {
+                "total": len(own), "completed": completed, "pending": len(own) - completed}})
+        if path == "/todos":
+            if method == "GET":
+                with store.lock:
+                    own = [todo for todo in store.todos.values() if todo["userId"] == user_id]
+                return self.send_json(200, {"success": True, "data": {"todos": own}})
+            if method == "POST":
+                if not body.get("title"):
+                    return self.send_json(400, {"success": False, "message": "Validation error"})
+                with store.lock:
+                    todo = {"id": store.next_todo_id, "userId": user_id, "completed": False,
+                            "title": body["title"], "description": body.get("description", ""),
+                            "priority": body.get("priority", "medium"), "category": body.get("category", "general")}
+                    store.next_todo_id += 1
+                    store.todos[todo["id"]] = todo
+                return self.send_json(201, {"success": True, "data": {"todo": todo}})
+        match = TODO_PATH.match(path)
+        if not match:
+            return self.send_json(404, {"success": False, "message": "Route not found"})
+        todo_id, action = int(match.group(1)), match.group(2)
+        with store.lock:
+            todo = store.todos.get(todo_id)
+            if todo is None or todo["userId"] != user_id:
+                return self.send_json(404, {"success": False, "message": "Todo not found"})
+            if method == "GET" and not action:
+                return self.send_json(200, {"success": True, "data": {"todo": dict(todo)}})
+            if method == "PUT" and not action:
+                todo.update({key: value for key, value in body.items()
+                             if key in ("title", "description", "priority", "category", "completed")})
+                return self.send_json(200, {"success": True, "data": {"todo": dict(todo)}})
+            if method == "PATCH" and action:
+                todo["completed"] = action == "/complete"
+                return self.send_json(200, {"success": True, "data": {"todo": dict(todo)}})
+            if method == "DELETE" and not action:
+                del store.todos[todo_id]
+                return self.send_json(200, {"success": True, "message": "Todo deleted successfully"})
+        return self.send_json(404, {"success": False, "message": "Route not found"})
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PUT(self):
+        self.handle_request("PUT")
+
+    def do_PATCH(self):
+        self.handle_request("PATCH")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+
+class StandinServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 overflows when a load test connects many
+    # users at once; dropped SYNs are retried after ~1s and show up as latency
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def create_server(host="127.0.0.1", port=8099, token_ttl=86400, latency_ms=0):
+    handler = type("Handler", (StandinHandler,), {
+        "store": Store(), "token_ttl": token_ttl, "latency": latency_ms / 1000.0,
+    })
+    return StandinServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory stand-in for the Todo App services")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--token-ttl", type=int, default=86400, help="Issued JWT lifetime in seconds")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Artificial delay added to every response")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.token_ttl, args.latency_ms)
+    print(f"🧪 Stand-in target listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Matrix slices against a local stand-in: run with `python -m pytest test_matrix.py`
+"""
+
+import matrix  # noqa: F401  (imports locust first for gevent monkey patching)
+
+import signal
+import socket
+
+from distributed import LOCUSTFILE, start_standin
+from matrix import TargetRun, load_user_classes, target_urls
+from recorder import read_recording
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_artifacts_stay_open_across_slices(tmp_path):
+    standin, urls = start_standin(free_port())
+    profile = {"users": 2, "spawn_rate": 10, "seed": 7}
+    extra_args = ["--record", str(tmp_path / "{target}-recording.jsonl"),
+                  "--failure-log", str(tmp_path / "{target}-failures.jsonl")]
+    try:
+        run = TargetRun({"name": "local"}, target_urls({}, urls["auth_url"]), profile,
+                        load_user_classes(LOCUSTFILE, ["TodoAppUser"]), LOCUSTFILE, extra_args)
+        stops = []
+        run.test_stop.add_listener(lambda environment, **kwargs: stops.append(environment))
+        recorder, failure_log = run.environment.recorder, run.environment.failure_log
+
+        counts = []
+        for _ in range(2):
+            run.run_slice(profile, warmup=0.5, seconds=1)
+            assert not recorder.file.closed
+            assert not failure_log.file.closed
+            assert not stops
+            counts.append(recorder.count)
+        assert 0 < counts[0] < counts[1]
+
+        run.quit()
+        assert stops == [run.environment]
+        assert recorder.file.closed and failure_log.file.closed
+        _, records = read_recording(str(tmp_path / "local-recording.jsonl"))
+        assert len(list(records)) == counts[1]
+    finally:
+        standin.send_signal(signal.SIGINT)
+        standin.wait(timeout=10)
@@ -0,0 +1,131 @@
+"""
+JWT Lifecycle Management for Locust Users
+Tracks token expiry locally by decoding the JWT `exp` claim (without
+verifying the signature) and re-authenticates in a background greenlet
+before the token expires, so tasks never stall on auth or turn into 401s.
+"""
+
+import base64
+import json
+import time
+
+import gevent
+from gevent.pool import Group
+
+REAUTH_REQUEST_NAME = "Re-auth Login"
+
+# Failed re-auths are retried no sooner than this, doubling up to the maximum
+MIN_RETRY_INTERVAL = 5.0
+MAX_RETRY_INTERVAL = 60.0
+
+
+def decode_exp(token):
+    """Return the `exp` claim of a JWT as a unix timestamp, or None"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenManager:
+    """
+    Holds one user's token and refreshes it `margin` seconds before expiry.
+
+    `reauthenticate` is called from a background greenlet started with
+    `spawn` (the user's greenlet group, so it dies with the user) and must
+    return a new token (or None on failure). Tasks keep using the current
+    token while the refresh is in flight; they only wait if it has already
+    expired. Failed refreshes back off so an unreachable auth service does
+    not turn every task into a synchronous login.
+    """
+
+    def __init__(self, reauthenticate, margin=60, stats=None, clock=time.time, spawn=gevent.spawn):
+        self.reauthenticate = reauthenticate
+        self.base_margin = margin
+        self.margin = margin
+        self.stats = stats if stats is not None else {}
+        self.clock = clock
+        self.spawn = spawn
+        self.token = None
+        self.expires_at = None
+        self.refreshing = None
+        self.retry_at = 0.0
+        self.retry_interval = MIN_RETRY_INTERVAL
+        self.stopped = False
+
+    def set(self, token):
+        self.token = token
+        self.expires_at = decode_exp(token) if token else None
+
+    def expired(self):
+        return self.expires_at is not None and self.clock() >= self.expires_at
+
+    def needs_refresh(self):
+        now = self.clock()
+        return self.expires_at is not None and now >= self.expires_at - self.margin and now >= self.retry_at
+
+    def current(self):
+        """Return the token to use now, starting a background refresh if it is due"""
+        if self.token and not self.stopped and self.needs_refresh() and not self.refreshing:
+            self.refreshing = self.spawn(self._refresh)
+        if self.refreshing and self.expired():
+            self.stats["expired_waits"] = self.stats.get("expired_waits", 0) + 1
+            self.refreshing.join()
+        return self.token
+
+    def _refresh(self):
+        try:
+            token = self.reauthenticate()
+        finally:
+            self.refreshing = None
+        if token:
+            self.set(token)
+            self.margin = self.base_margin
+            self.retry_at = 0.0
+            self.retry_interval = MIN_RETRY_INTERVAL
+            self.stats["refreshes"] = self.stats.get("refreshes", 0) + 1
+        else:
+            self.stats["failures"] = self.stats.get("failures", 0) + 1
+            # Back off until half way to expiry, and never retry sooner than retry_interval
+            if self.expires_at is not None:
+                self.margin = max((self.expires_at - self.clock()) / 2.0, 0)
+            self.retry_at = self.clock() + self.retry_interval
+            self.retry_interval = min(self.retry_interval * 2, MAX_RETRY_INTERVAL)
+
+    def stop(self):
+        """Kill an in-flight refresh and start no new ones (called from the user's on_stop)"""
+        self.stopped = True
+        if self.refreshing:
+            self.refreshing.kill()
+            self.refreshing = None
+
+
+class ManagedTokenMixin:
+    """
+    Routes a user's `auth_token` attribute through a TokenManager.
+
+    The user must set `self.tokens` and implement `reauthenticate()`.
+    Refreshes run in a group of the user's own, not the runner's user group,
+    so they never count as users and die with the user in `on_stop`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.background = Group()
+
+    def spawn_in_group(self, *args, **kwargs):
+        return self.background.spawn(*args, **kwargs)
+
+    def on_stop(self):
+        self.tokens.stop()
+        self.background.kill()
+
+    @property
+    def auth_token(self):
+        return self.tokens.current()
+
+    @auth_token.setter
+    def auth_token(self, value):
+        self.tokens.set(value)